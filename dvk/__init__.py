@@ -5,6 +5,7 @@ This package contains reusable, protocol-agnostic utilities shared across skills
 - checksums
 - semantics transforms
 - shared-memory ring buffer
+- live notebook viewer
 - workdir layout helpers
 """
 
@@ -11,13 +11,18 @@ Isolation goal:
 Callers may pass either:
 - an explicit filesystem path, or
 - an id (protocol_id / command_set_id / model_id)
+
+Resolved paths are memoized per (name, spec_root, DVK_SPEC_ROOT, DVK_WORKDIR, cwd),
+so environment or cwd changes take effect immediately. Call clear_asset_cache()
+after moving/deleting asset files within a process.
 """
 
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 
 from dvk.workdir import default_workdir_root, project_workdir_root
 
@@ -47,7 +52,7 @@ def _try_file(p: Path) -> Optional[Path]:
     return None
 
 
-def resolve_protocol(protocol: str, *, spec_root: Optional[Path] = None) -> Path:
+def _resolve_protocol(protocol: str, *, spec_root: Optional[Path] = None) -> Path:
     p = Path(protocol).expanduser()
     if p.is_absolute():
         hit = _try_file(p)
@@ -75,7 +80,7 @@ def resolve_protocol(protocol: str, *, spec_root: Optional[Path] = None) -> Path
     raise FileNotFoundError(f"protocol not found: {protocol}")
 
 
-def resolve_command_set(commands: str, *, spec_root: Optional[Path] = None) -> Path:
+def _resolve_command_set(commands: str, *, spec_root: Optional[Path] = None) -> Path:
     p = Path(commands).expanduser()
     if p.is_absolute():
         hit = _try_file(p)
@@ -100,7 +105,7 @@ def resolve_command_set(commands: str, *, spec_root: Optional[Path] = None) -> P
     raise FileNotFoundError(f"command_set not found: {commands}")
 
 
-def resolve_model(model: str, *, spec_root: Optional[Path] = None) -> Path:
+def _resolve_model(model: str, *, spec_root: Optional[Path] = None) -> Path:
     p = Path(model).expanduser()
     if p.is_absolute():
         hit = _try_file(p)
@@ -124,3 +129,38 @@ def resolve_model(model: str, *, spec_root: Optional[Path] = None) -> Path:
 
     raise FileNotFoundError(f"model not found: {model}")
 
+
+_RESOLVERS: Dict[str, Callable[..., Path]] = {
+    "protocol": _resolve_protocol,
+    "command_set": _resolve_command_set,
+    "model": _resolve_model,
+}
+
+
+def _env_key() -> Tuple[Optional[str], Optional[str], str]:
+    # Everything besides (name, spec_root) that the resolvers depend on.
+    return os.environ.get("DVK_SPEC_ROOT"), os.environ.get("DVK_WORKDIR"), os.getcwd()
+
+
+@lru_cache(maxsize=256)
+def _resolve_cached(
+    kind: str, name: str, spec_root: Optional[Path], env_spec_root: Optional[str], env_workdir: Optional[str], cwd: str
+) -> Path:
+    # Misses raise FileNotFoundError and are not cached.
+    return _RESOLVERS[kind](name, spec_root=spec_root)
+
+
+def clear_asset_cache() -> None:
+    _resolve_cached.cache_clear()
+
+
+def resolve_protocol(protocol: str, *, spec_root: Optional[Path] = None) -> Path:
+    return _resolve_cached("protocol", protocol, spec_root, *_env_key())
+
+
+def resolve_command_set(commands: str, *, spec_root: Optional[Path] = None) -> Path:
+    return _resolve_cached("command_set", commands, spec_root, *_env_key())
+
+
+def resolve_model(model: str, *, spec_root: Optional[Path] = None) -> Path:
+    return _resolve_cached("model", model, spec_root, *_env_key())
@@ -8,37 +8,200 @@ protocol-specific checksum implementations.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import binascii
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+try:  # optional: hardware-accelerated CRC-32C (Castagnoli)
+    import crc32c as _crc32c  # type: ignore
+except Exception:  # pragma: no cover
+    _crc32c = None
+
+
+@lru_cache(maxsize=1)
+def _numpy() -> Any:
+    """
+    NumPy (optional, for the vectorized paths), or None if unavailable.
+    Imported on first use: small-frame checksums never need it, and importing
+    NumPy dominates the cold start of every CLI that imports this module.
+    """
+    try:
+        import numpy  # type: ignore
+    except Exception:  # pragma: no cover
+        return None
+    return numpy
+
+
+# Bit-reversal of every byte value, usable with bytes.translate.
+_REV8 = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
 
 
 def reflect_bits(value: int, width: int) -> int:
-    result = 0
-    for i in range(width):
-        if value & (1 << i):
-            result |= 1 << (width - 1 - i)
-    return result
+    # Reverse bits within each byte (LUT) and byte order (little -> big), then
+    # drop the padding bits when width is not a multiple of 8.
+    nbytes = (width + 7) // 8
+    value &= (1 << width) - 1
+    if nbytes == 1:
+        return _REV8[value] >> (8 - width)
+    rev = int.from_bytes(value.to_bytes(nbytes, "little").translate(_REV8), "big")
+    return rev >> (nbytes * 8 - width)
+
+
+def _crc_bitwise(data: bytes, width: int, poly: int, crc: int, refin: bool) -> int:
+    mask = (1 << width) - 1
+    if refin:
+        for b in data:
+            crc ^= b
+            for _ in range(8):
+                crc = (crc >> 1) ^ poly if (crc & 1) else (crc >> 1)
+        return crc & mask
+    topbit = 1 << (width - 1)
+    for b in data:
+        crc ^= (b << (width - 8)) & mask
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & mask if (crc & topbit) else (crc << 1) & mask
+    return crc
+
+
+@lru_cache(maxsize=32)
+def _crc_table(width: int, poly: int, refin: bool) -> Tuple[int, ...]:
+    """
+    256-entry lookup table for byte-at-a-time (Sarwate) CRC.
+    Entry i is the bitwise kernel applied to the single byte i from a zero register.
+    """
+    return tuple(_crc_bitwise(bytes((i,)), width, poly, 0, refin) for i in range(256))
+
+
+@lru_cache(maxsize=32)
+def _native_crc(width: int, poly: int, init: int, refin: bool) -> Optional[Callable[[bytes], int]]:
+    """
+    Return a C-backed kernel for well-known polynomials, else None.
+    The kernel returns the raw CRC register (before refout/xorout), like the table path.
+    - CRC-32 (reflected 0xEDB88320): zlib.crc32
+    - CRC-32C (reflected 0x82F63B78, init 0xFFFFFFFF): crc32c package if installed
+    - CRC-16/CCITT family (0x1021, not reflected): binascii.crc_hqx
+    """
+    if width == 32 and poly == 0xEDB88320 and refin:
+        # zlib.crc32(data, value) starts from register value^0xFFFFFFFF and returns register^0xFFFFFFFF.
+        seed = (init ^ 0xFFFFFFFF) & 0xFFFFFFFF
+        return lambda data: zlib.crc32(data, seed) ^ 0xFFFFFFFF
+    if _crc32c is not None and width == 32 and poly == 0x82F63B78 and refin and init == 0xFFFFFFFF:
+        return lambda data: _crc32c.crc32c(data) ^ 0xFFFFFFFF
+    if width == 16 and poly == 0x1021 and not refin:
+        seed16 = init & 0xFFFF
+        return lambda data: binascii.crc_hqx(data, seed16)
+    return None
+
+
+_JIT_MIN_LEN = 64
+
+
+@lru_cache(maxsize=1)
+def _crc_jit_kernels() -> Optional[Tuple[Callable[..., int], Callable[..., int]]]:
+    """
+    Numba-compiled slicing-by-8 CRC loops (reflected, forward), or None if Numba is unavailable.
+    Each iteration folds 8 input bytes through 8 tables; the tail uses table 0 (Sarwate).
+    Imported lazily so CLI cold start does not pay for the Numba import.
+    """
+    np = _numpy()
+    if np is None:
+        return None
+    try:
+        from numba import njit  # type: ignore
+    except Exception:
+        return None
+
+    @njit(cache=True, boundscheck=False, nogil=True)
+    def crc_reflected(buf, tables, crc):  # pragma: no cover - compiled
+        n = buf.shape[0]
+        i = 0
+        while i + 8 <= n:
+            x = crc
+            for k in range(8):
+                x ^= np.uint64(buf[i + k]) << np.uint64(8 * k)
+            crc = np.uint64(0)
+            for k in range(8):
+                crc ^= tables[7 - k, (x >> np.uint64(8 * k)) & np.uint64(0xFF)]
+            i += 8
+        while i < n:
+            crc = tables[0, (crc ^ buf[i]) & np.uint64(0xFF)] ^ (crc >> np.uint64(8))
+            i += 1
+        return crc
+
+    @njit(cache=True, boundscheck=False, nogil=True)
+    def crc_forward(buf, tables, crc, width, mask):  # pragma: no cover - compiled
+        n = buf.shape[0]
+        shift = width - np.uint64(8)
+        i = 0
+        while i + 8 <= n:
+            x = crc << (np.uint64(64) - width)
+            for k in range(8):
+                x ^= np.uint64(buf[i + k]) << np.uint64(56 - 8 * k)
+            crc = np.uint64(0)
+            for k in range(8):
+                crc ^= tables[k, (x >> np.uint64(8 * k)) & np.uint64(0xFF)]
+            i += 8
+        while i < n:
+            crc = ((crc << np.uint64(8)) & mask) ^ tables[0, ((crc >> shift) ^ buf[i]) & np.uint64(0xFF)]
+            i += 1
+        return crc
+
+    return crc_reflected, crc_forward
+
+
+@lru_cache(maxsize=32)
+def _crc_tables8(width: int, poly: int, refin: bool) -> Any:
+    """
+    Slicing-by-8 tables: tables[k][i] is the CRC register after byte i followed by k zero bytes.
+    """
+    mask = (1 << width) - 1
+    t0 = _crc_table(width, poly, refin)
+    rows = [t0]
+    for _ in range(7):
+        prev = rows[-1]
+        if refin:
+            rows.append(tuple((v >> 8) ^ t0[v & 0xFF] for v in prev))
+        else:
+            rows.append(tuple(((v << 8) & mask) ^ t0[(v >> (width - 8)) & 0xFF] for v in prev))
+    np = _numpy()
+    tables = np.array(rows, dtype=np.uint64)
+    tables.setflags(write=False)
+    return tables
 
 
 def crc_compute(data: bytes, width: int, poly: int, init: int, xorout: int, refin: bool, refout: bool) -> int:
     """
-    Bitwise CRC with configurable parameters.
+    Table-driven CRC with configurable parameters.
+    Well-known parameter sets are dispatched to C implementations (see `_native_crc`).
     NOTE: `poly` is used as-is. For reflected CRCs (refin=True) provide the reflected polynomial.
     """
     mask = (1 << width) - 1
     crc = init & mask
 
-    if refin:
+    native = _native_crc(width, poly, crc, bool(refin))
+    if native is not None:
+        crc = native(data)
+    elif width < 8:
+        crc = _crc_bitwise(data, width, poly, crc, refin)
+    elif len(data) >= _JIT_MIN_LEN and _crc_jit_kernels() is not None:
+        crc_reflected, crc_forward = _crc_jit_kernels()
+        np = _numpy()
+        buf = np.frombuffer(data, dtype=np.uint8)
+        tables = _crc_tables8(width, poly, bool(refin))
+        if refin:
+            crc = int(crc_reflected(buf, tables, np.uint64(crc)))
+        else:
+            crc = int(crc_forward(buf, tables, np.uint64(crc), np.uint64(width), np.uint64(mask)))
+    elif refin:
+        table = _crc_table(width, poly, True)
         for b in data:
-            crc ^= b
-            for _ in range(8):
-                crc = (crc >> 1) ^ poly if (crc & 1) else (crc >> 1)
-        crc &= mask
+            crc = table[(crc ^ b) & 0xFF] ^ (crc >> 8)
     else:
-        topbit = 1 << (width - 1)
+        table = _crc_table(width, poly, False)
+        shift = width - 8
         for b in data:
-            crc ^= (b << (width - 8)) & mask
-            for _ in range(8):
-                crc = ((crc << 1) ^ poly) & mask if (crc & topbit) else (crc << 1) & mask
+            crc = ((crc << 8) & mask) ^ table[((crc >> shift) ^ b) & 0xFF]
 
     if refout:
         crc = reflect_bits(crc, width)
@@ -46,10 +209,21 @@ def crc_compute(data: bytes, width: int, poly: int, init: int, xorout: int, refi
     return crc & mask
 
 
+# Below this many bytes the built-in sum beats NumPy's per-call setup cost.
+_SUM8_NUMPY_MIN = 512
+
+
 def checksum_sum8(frame: bytes, start: int, end: int) -> int:
+    n = end + 1 - start
+    np = _numpy() if n >= _SUM8_NUMPY_MIN else None
+    if np is not None:
+        return int(np.frombuffer(frame, dtype=np.uint8, count=n, offset=start).sum(dtype=np.uint64)) & 0xFF
     return sum(frame[start : end + 1]) & 0xFF
 
 
+_CS15_WORDS = 32
+
+
 def checksum_cs15(data: bytes) -> int:
     """
     CS15 from 《激光雷达通信协议_V0.1》 pseudo-code:
@@ -57,12 +231,17 @@ def checksum_cs15(data: bytes) -> int:
     - chk32 = (chk32 << 1) + data_int
     - checksum = (chk32 & 0x7FFF) + (chk32 >> 15)
     - checksum = checksum & 0x7FFF
+
+    Word i of n is weighted by 2**(n-1-i), so only the last 32 words can reach
+    the bits that survive the fold; earlier words are skipped.
     """
-    if len(data) % 2 == 1:
-        data = data + b"\x00"
+    nwords = (len(data) + 1) // 2
+    tail = bytes(data[max(0, nwords - _CS15_WORDS) * 2 :])
+    if len(tail) % 2 == 1:
+        tail += b"\x00"
     chk32 = 0
-    for i in range(0, len(data), 2):
-        data_int = data[i] | (data[i + 1] << 8)
+    for i in range(0, len(tail), 2):
+        data_int = tail[i] | (tail[i + 1] << 8)
         chk32 = (chk32 << 1) + data_int
     checksum = (chk32 & 0x7FFF) + (chk32 >> 15)
     return int(checksum) & 0x7FFF
@@ -88,7 +267,7 @@ def read_expected_checksum(frame: bytes, store_at: int, store_format: str) -> in
     end = start + n
     if start < 0 or end > len(frame):
         raise ValueError("Checksum field out of bounds")
-    raw = frame[start:end]
+    raw = _as_buf(frame)[start:end]
     if store_format == "uint8":
         return raw[0]
     if store_format.endswith("_le"):
@@ -98,87 +277,172 @@ def read_expected_checksum(frame: bytes, store_at: int, store_format: str) -> in
     raise ValueError(f"Unsupported store_format: {store_format}")
 
 
-def checksum_xor16_slices(frame: bytes, params: Dict[str, Any]) -> int:
-    """
-    Generic XOR16 checksum:
-    - xor_low is XOR of frame[offset] for offsets in `seed_low_offsets`
-    - xor_up  is XOR of frame[offset] for offsets in `seed_up_offsets`
-    - then process one or more `data_slices`, each iterates positions with `stride`:
-      - xor_low XOR= frame[pos + rel] for rel in `low_rel_offsets`
-      - xor_up  XOR= frame[pos + rel] for rel in `up_rel_offsets`
-    Returns (xor_up<<8) | xor_low.
-    """
-    seed_low_offsets: List[int] = list(params.get("seed_low_offsets", []))
-    seed_up_offsets: List[int] = list(params.get("seed_up_offsets", []))
-    data_slices: List[Dict[str, Any]] = list(params.get("data_slices", []))
+class _XorSpec(NamedTuple):
+    """xor16_slices params normalized to ints once (hashable, so it keys the index cache)."""
+
+    seed_low: Tuple[int, ...]
+    seed_up: Tuple[int, ...]
+    # (from, to|None, stride, low_rel_offsets, up_rel_offsets)
+    slices: Tuple[Tuple[int, Optional[int], int, Tuple[int, ...], Tuple[int, ...]], ...]
 
-    xor_low = 0
-    xor_up = 0
 
-    for off in seed_low_offsets:
-        if 0 <= off < len(frame):
-            xor_low ^= frame[off]
-    for off in seed_up_offsets:
-        if 0 <= off < len(frame):
-            xor_up ^= frame[off]
+def _compile_xor16(params: Dict[str, Any]) -> _XorSpec:
+    slices = []
+    for sl in params.get("data_slices", []):
+        slices.append(
+            (
+                int(sl.get("from", 0)),
+                None if sl.get("to") is None else int(sl["to"]),
+                int(sl.get("stride", 1)),
+                tuple(int(x) for x in sl.get("low_rel_offsets", [])),
+                tuple(int(x) for x in sl.get("up_rel_offsets", [])),
+            )
+        )
+    return _XorSpec(
+        tuple(int(x) for x in params.get("seed_low_offsets", [])),
+        tuple(int(x) for x in params.get("seed_up_offsets", [])),
+        tuple(slices),
+    )
+
 
-    for sl in data_slices:
-        start = int(sl.get("from", 0))
-        end = int(sl.get("to", len(frame) - 1))
-        stride = int(sl.get("stride", 1))
-        low_rel = [int(x) for x in sl.get("low_rel_offsets", [])]
-        up_rel = [int(x) for x in sl.get("up_rel_offsets", [])]
+@lru_cache(maxsize=64)
+def _xor16_indices(spec: _XorSpec, frame_len: int) -> Tuple[Any, Any]:
+    """
+    Resolve an xor16_slices spec to the flat (low, up) byte index lists for one frame length.
+    Returned as NumPy index arrays when NumPy is available, else tuples.
+    """
+    seed_low, seed_up, slices = spec
+    low = [off for off in seed_low if 0 <= off < frame_len]
+    up = [off for off in seed_up if 0 <= off < frame_len]
 
+    for start, end, stride, low_rel, up_rel in slices:
+        if end is None:
+            end = frame_len - 1
         if stride <= 0:
             continue
         if end < 0:
-            end = len(frame) + end
+            end = frame_len + end
         if start < 0:
-            start = len(frame) + start
+            start = frame_len + start
         if start < 0:
             start = 0
-        if end >= len(frame):
-            end = len(frame) - 1
+        if end >= frame_len:
+            end = frame_len - 1
         if start > end:
             continue
 
-        pos = start
-        while pos <= end:
+        for pos in range(start, end + 1, stride):
             for rel in low_rel:
                 idx = pos + rel
-                if 0 <= idx < len(frame):
-                    xor_low ^= frame[idx]
+                if 0 <= idx < frame_len:
+                    low.append(idx)
             for rel in up_rel:
                 idx = pos + rel
-                if 0 <= idx < len(frame):
-                    xor_up ^= frame[idx]
-            pos += stride
+                if 0 <= idx < frame_len:
+                    up.append(idx)
+
+    np = _numpy()
+    if np is not None:
+        low_arr = np.array(low, dtype=np.intp)
+        up_arr = np.array(up, dtype=np.intp)
+        low_arr.setflags(write=False)
+        up_arr.setflags(write=False)
+        return low_arr, up_arr
+    return tuple(low), tuple(up)
+
+
+def checksum_xor16_slices(frame: bytes, params: Dict[str, Any]) -> int:
+    """
+    Generic XOR16 checksum:
+    - xor_low is XOR of frame[offset] for offsets in `seed_low_offsets`
+    - xor_up  is XOR of frame[offset] for offsets in `seed_up_offsets`
+    - then process one or more `data_slices`, each iterates positions with `stride`:
+      - xor_low XOR= frame[pos + rel] for rel in `low_rel_offsets`
+      - xor_up  XOR= frame[pos + rel] for rel in `up_rel_offsets`
+    Returns (xor_up<<8) | xor_low.
+    """
+    return _xor16_reduce(frame, _cached(_XOR_SPEC_CACHE, params, _compile_xor16))
+
+
+def _xor16_reduce(frame: bytes, spec: _XorSpec) -> int:
+    low_idx, up_idx = _xor16_indices(spec, len(frame))
+
+    np = _numpy()
+    if np is not None:
+        arr = np.frombuffer(frame, dtype=np.uint8)
+        xor_low = int(np.bitwise_xor.reduce(arr[low_idx]))
+        xor_up = int(np.bitwise_xor.reduce(arr[up_idx]))
+    else:
+        xor_low = 0
+        xor_up = 0
+        for idx in low_idx:
+            xor_low ^= frame[idx]
+        for idx in up_idx:
+            xor_up ^= frame[idx]
 
     return ((xor_up << 8) | xor_low) & 0xFFFF
 
 
-def compute_checksum(frame: bytes, checksum_spec: Dict[str, Any]) -> int:
+_SPEC_CACHE_SIZE = 256
+_COMPUTE_CACHE: Dict[int, Tuple[Dict[str, Any], Callable[[bytes], int]]] = {}
+_VERIFY_CACHE: Dict[int, Tuple[Dict[str, Any], Callable[[bytes], bool]]] = {}
+_XOR_SPEC_CACHE: Dict[int, Tuple[Dict[str, Any], _XorSpec]] = {}
+
+
+def _cached(cache: Dict[int, Tuple[Dict[str, Any], Any]], spec: Dict[str, Any], build: Callable[[Dict[str, Any]], Any]) -> Any:
+    """
+    Memoize a compiled closure per checksum spec object.
+    Dicts are not hashable or weak-referenceable, so entries are keyed by id() and keep the spec
+    alive (the id cannot be reused while cached). Specs are treated as immutable once used.
+    """
+    key = id(spec)
+    hit = cache.get(key)
+    if hit is not None and hit[0] is spec:
+        return hit[1]
+    fn = build(spec)
+    if len(cache) >= _SPEC_CACHE_SIZE:
+        cache.clear()
+    cache[key] = (spec, fn)
+    return fn
+
+
+def _as_buf(frame: bytes) -> memoryview:
+    """Zero-copy view of a frame; slicing it does not allocate a new bytes object."""
+    return frame if isinstance(frame, memoryview) else memoryview(frame)
+
+
+def _ranged(rng_from: int, rng_to: int, kernel: Callable[[memoryview, int, int], int]) -> Callable[[bytes], int]:
+    def compute(frame: bytes) -> int:
+        n = len(frame)
+        start = rng_from if rng_from >= 0 else n + rng_from
+        end = rng_to if rng_to >= 0 else n + rng_to
+        if start < 0 or end < 0 or start >= n or end >= n or end < start:
+            raise ValueError("Invalid checksum.range")
+        return kernel(_as_buf(frame), start, end)
+
+    return compute
+
+
+def _build_compute(checksum_spec: Dict[str, Any]) -> Callable[[bytes], int]:
     ctype = str(checksum_spec["type"])
 
     if ctype == "xor16_slices":
         params = checksum_spec.get("params")
         if not isinstance(params, dict):
             raise ValueError("xor16_slices requires checksum.params")
-        return checksum_xor16_slices(frame, params)
+        xor_spec = _compile_xor16(params)
+        return lambda frame: _xor16_reduce(frame, xor_spec)
 
     rng = checksum_spec.get("range")
     if not isinstance(rng, dict):
         raise ValueError("Checksum requires checksum.range")
-    start = resolve_index(int(rng["from"]), len(frame))
-    end = resolve_index(int(rng["to"]), len(frame))
-    if start < 0 or end < 0 or start >= len(frame) or end >= len(frame) or end < start:
-        raise ValueError("Invalid checksum.range")
-    data = frame[start : end + 1]
+    rng_from = int(rng["from"])
+    rng_to = int(rng["to"])
 
     if ctype == "sum8":
-        return checksum_sum8(frame, start, end)
+        return _ranged(rng_from, rng_to, checksum_sum8)
     if ctype == "cs15":
-        return checksum_cs15(data)
+        return _ranged(rng_from, rng_to, lambda buf, start, end: checksum_cs15(buf[start : end + 1]))
     if ctype in ("crc16", "crc32"):
         store_format = checksum_spec.get("store_format")
         if not store_format:
@@ -187,20 +451,21 @@ def compute_checksum(frame: bytes, checksum_spec: Dict[str, Any]) -> int:
         if not isinstance(params, dict):
             raise ValueError("CRC requires checksum.params")
         width = 16 if ctype == "crc16" else 32
-        return crc_compute(
-            data,
-            width=width,
-            poly=int(params["poly"]),
-            init=int(params["init"]),
-            xorout=int(params["xorout"]),
-            refin=bool(params["refin"]),
-            refout=bool(params["refout"]),
+        poly = int(params["poly"])
+        init = int(params["init"])
+        xorout = int(params["xorout"])
+        refin = bool(params["refin"])
+        refout = bool(params["refout"])
+        return _ranged(
+            rng_from,
+            rng_to,
+            lambda buf, start, end: crc_compute(buf[start : end + 1], width, poly, init, xorout, refin, refout),
         )
 
     raise ValueError(f"Unsupported checksum type: {ctype}")
 
 
-def verify_checksum(frame: bytes, checksum_spec: Dict[str, Any]) -> bool:
+def _build_verify(checksum_spec: Dict[str, Any]) -> Callable[[bytes], bool]:
     ctype = str(checksum_spec["type"])
 
     store_format = checksum_spec.get("store_format")
@@ -211,8 +476,32 @@ def verify_checksum(frame: bytes, checksum_spec: Dict[str, Any]) -> bool:
             store_format = "uint16_le"
         else:
             raise ValueError("checksum.store_format is required for this checksum type")
+    store_format = str(store_format)
+    store_at = int(checksum_spec["store_at"])
+    nbytes = _checksum_nbytes(store_format)
+    if store_format == "uint8" or store_format.endswith("_le"):
+        byteorder = "little"
+    elif store_format.endswith("_be"):
+        byteorder = "big"
+    else:
+        raise ValueError(f"Unsupported store_format: {store_format}")
+
+    compute = _cached(_COMPUTE_CACHE, checksum_spec, _build_compute)
 
-    expected = read_expected_checksum(frame, int(checksum_spec["store_at"]), str(store_format))
-    actual = compute_checksum(frame, checksum_spec)
-    return int(actual) == int(expected)
+    def verify(frame: bytes) -> bool:
+        n = len(frame)
+        start = store_at if store_at >= 0 else n + store_at
+        end = start + nbytes
+        if start < 0 or end > n:
+            raise ValueError("Checksum field out of bounds")
+        return compute(frame) == int.from_bytes(_as_buf(frame)[start:end], byteorder)
 
+    return verify
+
+
+def compute_checksum(frame: bytes, checksum_spec: Dict[str, Any]) -> int:
+    return _cached(_COMPUTE_CACHE, checksum_spec, _build_compute)(frame)
+
+
+def verify_checksum(frame: bytes, checksum_spec: Dict[str, Any]) -> bool:
+    return _cached(_VERIFY_CACHE, checksum_spec, _build_verify)(frame)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+DVK live point-cloud viewer for notebooks.
+
+Consumes a DVK SharedMemory ring (`dvk.<device_id>`) and redraws a 2D point
+cloud in the running notebook. Plotly (FigureWidget + Scattergl) is preferred;
+matplotlib is the fallback.
+
+The generated live notebook only imports and calls `run_live`, so the loop is
+compiled once (and cached in __pycache__) instead of being re-parsed from a
+notebook cell every session.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from .shm import ShmHandles, attach_ring, read_since
+
+
+def wait_attach(name: str, timeout_s: float = 30.0, poll_s: float = 0.2) -> ShmHandles:
+    t0 = time.time()
+    last_err = None
+    while time.time() - t0 < timeout_s:
+        try:
+            return attach_ring(name)
+        except FileNotFoundError as e:
+            last_err = e
+            time.sleep(poll_s)
+    raise RuntimeError(
+        f"SharedMemory '{name}' not found (waited {timeout_s}s). "
+        "Start a publisher to create it, then retry."
+    ) from last_err
+
+
+class _LiveWindow:
+    """
+    Local window of the newest points. Only points written since the last tick
+    are read from SharedMemory (read_since) and appended.
+
+    If the publisher restarts with --overwrite-shm, the consumer may hold stale
+    SHM handles; the ring is re-attached when the writer's seq/last_write_ns
+    stops moving for `stale_limit` ticks.
+    """
+
+    def __init__(self, base: str, h: ShmHandles, max_points: int, stale_limit: int) -> None:
+        self.base = base
+        self.h = h
+        self.max_points = int(max_points)
+        self.stale_limit = int(stale_limit)
+        self.buf = np.empty((self.max_points,), dtype=h.data.dtype)
+        self.pts = np.zeros((0,), dtype=h.data.dtype)
+        self.total: Optional[int] = None
+        self.seq = 0
+        self._stale_ticks = 0
+        self._last_seq = -1
+        self._last_ns = -1
+
+    def poll(self) -> bool:
+        """One tick. Returns True when `pts` changed (or is still empty)."""
+        h = self.h
+        # h.seq / h.last_write_ns are pre-bound ctrl views (no structured-field lookup per tick).
+        seq = int(h.seq[0])
+        ns = int(h.last_write_ns[0])
+        self.seq = seq
+        if seq == self._last_seq and ns == self._last_ns:
+            self._stale_ticks += 1
+        else:
+            self._stale_ticks = 0
+            self._last_seq, self._last_ns = seq, ns
+        if self._stale_ticks >= self.stale_limit:
+            try:
+                self.h = h = attach_ring(self.base)
+                self.total = None
+                self.pts = self.pts[:0]
+            except Exception:
+                pass
+            self._stale_ticks = 0
+
+        new, self.total = read_since(h, self.total, self.max_points, out=self.buf)
+        pts = self.pts
+        if len(new) == 0 and len(pts) > 0:
+            return False
+        keep = min(len(pts), min(self.max_points, h.capacity) - len(new))
+        self.pts = np.concatenate((pts[len(pts) - keep :], new))
+        return True
+
+
+def _run_plotly(win: _LiveWindow, fps: float, ticks: int) -> None:
+    import plotly.graph_objects as go
+    from IPython.display import display
+
+    fig = go.FigureWidget(
+        data=[go.Scattergl(x=[], y=[], mode="markers", marker=dict(size=2))],
+        layout=go.Layout(
+            title="Live 2D point cloud",
+            xaxis=dict(scaleanchor="y", scaleratio=1),
+            yaxis=dict(),
+            margin=dict(l=20, r=20, t=40, b=20),
+        ),
+    )
+    display(fig)
+
+    period = 1.0 / fps
+    for _ in range(ticks):
+        if not win.poll():
+            time.sleep(period)
+            continue
+        pts = win.pts
+        if len(pts) > 0:
+            with fig.batch_update():
+                # float32 field views; plotly takes ndarrays without a float64 round-trip.
+                fig.data[0].x = pts["x"]
+                fig.data[0].y = pts["y"]
+                fig.layout.title = f"Live 2D point cloud (n={len(pts)}, seq={win.seq})"
+                fig.layout.xaxis.autorange = True
+                fig.layout.yaxis.autorange = True
+        else:
+            with fig.batch_update():
+                fig.data[0].x = []
+                fig.data[0].y = []
+                fig.layout.title = f"Live 2D point cloud (waiting..., seq={win.seq})"
+        time.sleep(period)
+
+
+def _run_matplotlib(win: _LiveWindow, fps: float, ticks: int) -> None:
+    import matplotlib.pyplot as plt
+    from IPython import get_ipython
+    from IPython.display import display
+
+    # If you have ipympl installed, widget backend may improve smoothness.
+    try:
+        get_ipython().run_line_magic("matplotlib", "widget")
+    except Exception:
+        pass
+
+    plt.ioff()
+    fig, ax = plt.subplots(figsize=(7, 7))
+    sc = ax.scatter([], [], s=1)
+    ax.set_aspect("equal", adjustable="box")
+    ax.grid(True)
+    handle = display(fig, display_id=True)
+
+    period = 1.0 / fps
+    last_seq = -1
+    for _ in range(ticks):
+        if not win.poll():
+            time.sleep(period)
+            continue
+        pts = win.pts
+        if len(pts) > 0:
+            xs = pts["x"]
+            ys = pts["y"]
+            sc.set_offsets(np.column_stack((xs, ys)))
+            ax.set_title(f"Live 2D point cloud (n={len(pts)}, seq={win.seq})")
+            xmin, xmax = float(xs.min()), float(xs.max())
+            ymin, ymax = float(ys.min()), float(ys.max())
+            span = max(xmax - xmin, ymax - ymin)
+            pad = span * 0.05
+            if not np.isfinite(pad) or pad <= 0:
+                pad = 1.0
+            ax.set_xlim(xmin - pad, xmax + pad)
+            ax.set_ylim(ymin - pad, ymax + pad)
+        else:
+            sc.set_offsets(np.zeros((0, 2), dtype=np.float32))
+            ax.set_title(f"Live 2D point cloud (waiting..., seq={win.seq})")
+
+        if win.seq != last_seq:
+            handle.update(fig)
+            last_seq = win.seq
+
+        time.sleep(period)
+
+
+def run_live(
+    device_id: str,
+    *,
+    max_points: int = 20000,
+    fps: float = 6,
+    ticks: int = 10_000,
+    attach_timeout_s: float = 30.0,
+) -> None:
+    """
+    Attach to `dvk.<device_id>` and redraw the newest `max_points` points at
+    up to `fps` frames per second, for `ticks` iterations.
+    """
+    if max_points <= 0:
+        raise ValueError("max_points must be > 0")
+    if fps <= 0:
+        raise ValueError("fps must be > 0")
+    base = f"dvk.{device_id}"
+    h = wait_attach(base, timeout_s=attach_timeout_s)
+    win = _LiveWindow(base, h, max_points=max_points, stale_limit=int(fps * 2))
+
+    # Preferred: Plotly (mature, WebGL Scattergl). Fallback: matplotlib.
+    try:
+        _run_plotly(win, fps, ticks)
+    except Exception:
+        _run_matplotlib(win, fps, ticks)
@@ -4,6 +4,10 @@ DVK semantic decoding utilities shared across skills.
 
 Semantic decoding turns byte-level decoded records into analysis-ready tables
 based on rules defined in commands.yaml (CommandSet + TelemetrySet).
+
+Byte fields (e.g. `samples`) may be given either as hex strings, as written
+by protocol_decode_skill, or as raw bytes/bytearray/memoryview from in-process
+decoders, which avoids hex encoding and decoding.
 """
 
 from __future__ import annotations
@@ -12,15 +16,42 @@ import json
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
+
+# Row layout of point-cloud transforms when emitting arrays (as_dicts=False).
+# Must match dvk.shm._POINT_DTYPE so results can be fed to write_points as-is.
+_POINT_ROW_DTYPE = np.dtype(
+    [
+        ("x", "<f4"),
+        ("y", "<f4"),
+        ("angle_deg", "<f4"),
+        ("distance", "<f4"),
+        ("intensity", "<f4"),
+        ("frame_idx", "<u4"),
+        ("point_idx", "<u4"),
+    ]
+)
+
 
 @dataclass(frozen=True)
 class SemanticResult:
     records: List[Dict[str, Any]]
     applied: bool
     reason: str
+    points: Optional[np.ndarray] = None
+    # Keys of every record when a transform produced them (uniform rows); None otherwise.
+    field_names: Optional[List[str]] = None
 
 
 def _hex_to_bytes(value: Any) -> Optional[bytes]:
+    # Decoders may hand over raw bytes instead of hex text; skip the round-trip.
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, bytearray):
+        return bytes(value)
+    if isinstance(value, memoryview):
+        return value.tobytes()
     if not isinstance(value, str):
         return None
     try:
@@ -53,12 +84,37 @@ def _wrap_delta(start_deg: float, end_deg: float, n: int) -> float:
     return (end_deg - start_deg) / (n - 1)
 
 
-def _transform_triplet_pointcloud_v1(raw_records: List[Dict[str, Any]], cfg: Dict[str, Any]) -> SemanticResult:
+def _point_rows(frame_idx: Any, angles: np.ndarray, dist: np.ndarray, intensity: np.ndarray) -> np.ndarray:
+    n = int(angles.shape[0])
+    rows = np.empty((n,), dtype=_POINT_ROW_DTYPE)
+    dist_f = dist.astype(np.float64)
+    theta = np.deg2rad(angles)
+    rows["x"] = dist_f * np.cos(theta)
+    rows["y"] = dist_f * np.sin(theta)
+    rows["angle_deg"] = angles
+    rows["distance"] = dist_f
+    rows["intensity"] = intensity
+    rows["frame_idx"] = _as_int(frame_idx) or 0
+    rows["point_idx"] = np.arange(n, dtype=np.uint32)
+    return rows
+
+
+def _points_result(chunks: List[np.ndarray], reason: str) -> SemanticResult:
+    if not chunks:
+        return SemanticResult(records=[], applied=False, reason="No points produced (missing fields or empty payload).")
+    points = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+    return SemanticResult(records=[], applied=True, reason=reason, points=points)
+
+
+def _transform_triplet_pointcloud_v1(
+    raw_records: List[Dict[str, Any]], cfg: Dict[str, Any], as_dicts: bool = True
+) -> SemanticResult:
     frame_name = cfg.get("frame_name")
     input_field = str(cfg.get("input_field") or "samples")
     count_ref = str(cfg.get("count_ref") or "lsn")
 
     out_records: List[Dict[str, Any]] = []
+    out_chunks: List[np.ndarray] = []
 
     dist_cfg = cfg.get("distance") or {}
     inten_cfg = cfg.get("intensity") or {}
@@ -104,43 +160,56 @@ def _transform_triplet_pointcloud_v1(raw_records: List[Dict[str, Any]], cfg: Dic
         end_deg = _angle_deg_from_raw(end_raw, right_shift=right_shift, scale_div=scale_div, offset=offset)
         delta = _wrap_delta(start_deg, end_deg, count)
 
-        for i in range(count):
-            base = i * 3
-            if base + 2 >= len(payload):
-                break
-            b0 = payload[base]
-            b1 = payload[base + 1]
-            b2 = payload[base + 2]
-
-            dist = ((b2 & 0xFF) << dist_b2_shift) | ((b1 >> dist_b1_shift) & dist_b1_mask)
-            dist &= dist_mask
+        # Clamp once to the complete triplets present; delta still spans the declared count.
+        n = min(count, len(payload) // 3)
+        if n <= 0:
+            continue
+        cols = np.frombuffer(payload, dtype=np.uint8, count=n * 3).reshape(n, 3).astype(np.int64)
+        b0, b1, b2 = cols[:, 0], cols[:, 1], cols[:, 2]
 
-            inten = ((b1 & inten_b1_mask) << inten_b1_shift) | ((b0 >> inten_b0_shift) & inten_b0_mask)
+        dist = (((b2 & 0xFF) << dist_b2_shift) | ((b1 >> dist_b1_shift) & dist_b1_mask)) & dist_mask
+        inten = ((b1 & inten_b1_mask) << inten_b1_shift) | ((b0 >> inten_b0_shift) & inten_b0_mask)
+        hr = b0 & hr_mask
 
-            hr = b0 & hr_mask
+        angles = start_deg + (np.arange(n, dtype=np.float64) * delta)
+        angles = np.where(angles >= 360.0, angles - 360.0, angles)
 
-            angle = start_deg + (i * delta)
-            if angle >= 360.0:
-                angle -= 360.0
+        frame_idx = frame.get("_frame_idx")
+        if not as_dicts:
+            out_chunks.append(_point_rows(frame_idx, angles, dist, inten))
+            continue
 
+        extra = [(k, frame.get(k)) for k in include_frame_fields]
+        for i, angle, d, it, h in zip(range(n), angles.tolist(), dist.tolist(), inten.tolist(), hr.tolist()):
             row: Dict[str, Any] = {
-                "_frame_idx": frame.get("_frame_idx"),
+                "_frame_idx": frame_idx,
                 "_point_idx": i,
                 "angle_deg": angle,
-                "distance_raw": dist,
-                "intensity": inten,
-                "hr_flag": hr,
+                "distance_raw": d,
+                "intensity": it,
+                "hr_flag": h,
             }
-            for k in include_frame_fields:
-                row[k] = frame.get(k)
+            for k, v in extra:
+                row[k] = v
             out_records.append(row)
 
+    if not as_dicts:
+        return _points_result(out_chunks, "triplet_pointcloud_v1 applied.")
     if not out_records:
         return SemanticResult(records=[], applied=False, reason="No points produced (missing fields or empty payload).")
-    return SemanticResult(records=out_records, applied=True, reason="triplet_pointcloud_v1 applied.")
-
-
-def _transform_if_dn_pointcloud_v1(raw_records: List[Dict[str, Any]], cfg: Dict[str, Any]) -> SemanticResult:
+    fields = list(
+        dict.fromkeys(
+            ["_frame_idx", "_point_idx", "angle_deg", "distance_raw", "intensity", "hr_flag", *include_frame_fields]
+        )
+    )
+    return SemanticResult(
+        records=out_records, applied=True, reason="triplet_pointcloud_v1 applied.", field_names=fields
+    )
+
+
+def _transform_if_dn_pointcloud_v1(
+    raw_records: List[Dict[str, Any]], cfg: Dict[str, Any], as_dicts: bool = True
+) -> SemanticResult:
     frame_name = cfg.get("frame_name")
     input_field = str(cfg.get("input_field") or "samples")
     count_ref = str(cfg.get("count_ref") or "dn")
@@ -173,6 +242,7 @@ def _transform_if_dn_pointcloud_v1(raw_records: List[Dict[str, Any]], cfg: Dict[
         unit_bytes = 4
 
     out_records: List[Dict[str, Any]] = []
+    out_chunks: List[np.ndarray] = []
 
     for frame in raw_records:
         if frame_name and frame.get("_frame_name") != frame_name:
@@ -200,44 +270,66 @@ def _transform_if_dn_pointcloud_v1(raw_records: List[Dict[str, Any]], cfg: Dict[
         speed_raw = _as_int(frame.get(speed_field))
         speed_rps = (float(speed_raw) / speed_div) if speed_raw is not None else None
 
-        for i in range(count):
-            base = i * unit_bytes
-            if base + 1 >= len(payload):
-                break
-            dist = int.from_bytes(payload[base : base + 2], "little", signed=False) & dist_mask
-
-            brightness = None
-            if brightness_mode == "u8":
-                if base + 2 >= len(payload):
-                    break
-                brightness = payload[base + 2]
-            elif brightness_mode == "u16_le":
-                if base + 3 >= len(payload):
-                    break
-                brightness = int.from_bytes(payload[base + 2 : base + 4], "little", signed=False)
-
-            angle = start_deg + (i * delta)
-            if angle >= 360.0:
-                angle -= 360.0
+        # Clamp once to the complete points present; delta still spans the declared count.
+        n = min(count, len(payload) // unit_bytes)
+        if n <= 0:
+            continue
+        if unit_bytes == 2:
+            dist = np.frombuffer(payload, dtype="<u2", count=n).astype(np.int64) & dist_mask
+            bright = None
+        else:
+            cols = np.frombuffer(payload, dtype=np.uint8, count=n * unit_bytes).reshape(n, unit_bytes).astype(np.int64)
+            dist = (cols[:, 0] | (cols[:, 1] << 8)) & dist_mask
+            bright = cols[:, 2] if unit_bytes == 3 else (cols[:, 2] | (cols[:, 3] << 8))
 
+        angles = start_deg + (np.arange(n, dtype=np.float64) * delta)
+        angles = np.where(angles >= 360.0, angles - 360.0, angles)
+
+        frame_idx = frame.get("_frame_idx")
+        if not as_dicts:
+            inten = bright if bright is not None else np.zeros((n,), dtype=np.float32)
+            out_chunks.append(_point_rows(frame_idx, angles, dist, inten))
+            continue
+
+        brights = bright.tolist() if bright is not None else [None] * n
+        extra = [(k, frame.get(k)) for k in include_frame_fields]
+        for i, angle, d, brightness in zip(range(n), angles.tolist(), dist.tolist(), brights):
             row: Dict[str, Any] = {
-                "_frame_idx": frame.get("_frame_idx"),
+                "_frame_idx": frame_idx,
                 "_point_idx": i,
                 "angle_deg": angle,
-                "distance_raw": dist,
+                "distance_raw": d,
                 "brightness": brightness,
                 "speed_rps": speed_rps,
             }
-            for k in include_frame_fields:
-                row[k] = frame.get(k)
+            for k, v in extra:
+                row[k] = v
             out_records.append(row)
 
+    if not as_dicts:
+        return _points_result(out_chunks, "if_dn_pointcloud_v1 applied.")
     if not out_records:
         return SemanticResult(records=[], applied=False, reason="No points produced (missing fields or empty payload).")
-    return SemanticResult(records=out_records, applied=True, reason="if_dn_pointcloud_v1 applied.")
-
-
-def apply_semantics(raw_records: List[Dict[str, Any]], *, commands: Dict[str, Any]) -> SemanticResult:
+    fields = list(
+        dict.fromkeys(
+            ["_frame_idx", "_point_idx", "angle_deg", "distance_raw", "brightness", "speed_rps", *include_frame_fields]
+        )
+    )
+    return SemanticResult(
+        records=out_records, applied=True, reason="if_dn_pointcloud_v1 applied.", field_names=fields
+    )
+
+
+def apply_semantics(
+    raw_records: List[Dict[str, Any]], *, commands: Dict[str, Any], as_dicts: bool = True
+) -> SemanticResult:
+    """
+    Apply the first telemetry transform in `commands` to decoded frame records.
+
+    With as_dicts=False, point-cloud transforms skip per-point dicts and return
+    a structured array (dtype matching dvk.shm._POINT_DTYPE) in `points`;
+    `records` is then empty.
+    """
     telemetry = commands.get("telemetry")
     if not isinstance(telemetry, dict):
         return SemanticResult(records=raw_records, applied=False, reason="No telemetry section in commands.")
@@ -252,9 +344,9 @@ def apply_semantics(raw_records: List[Dict[str, Any]], *, commands: Dict[str, An
 
     ttype = str(t0["type"])
     if ttype == "triplet_pointcloud_v1":
-        return _transform_triplet_pointcloud_v1(raw_records, t0)
+        return _transform_triplet_pointcloud_v1(raw_records, t0, as_dicts=as_dicts)
     if ttype == "if_dn_pointcloud_v1":
-        return _transform_if_dn_pointcloud_v1(raw_records, t0)
+        return _transform_if_dn_pointcloud_v1(raw_records, t0, as_dicts=as_dicts)
 
     return SemanticResult(records=raw_records, applied=False, reason=f"Unsupported telemetry transform type: {ttype}")
 
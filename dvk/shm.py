@@ -4,16 +4,19 @@ DVK shared-memory ring buffer for low-latency (near zero-copy) visualization.
 
 Design goals:
 - Fixed-capacity ring buffer: storage does not grow over time.
-- Producer writes points; consumer reads latest window.
+- Producer writes points; consumer reads latest window, or only the points
+  added since its last read (ctrl.write_count, see read_since).
 - Data stored as float32 columns for fast plotting.
+- ctrl.seq is a seqlock: odd while the producer is writing, even otherwise.
+  Readers retry when it is odd or changes across their copy.
 """
 
 from __future__ import annotations
 
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from multiprocessing import shared_memory
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 try:
@@ -31,7 +34,7 @@ _CTRL_DTYPE = np.dtype(
         ("version", "<u4"),
         ("capacity", "<u4"),
         ("write_index", "<u4"),
-        ("_pad0", "<u4"),
+        ("write_count", "<u4"),  # total points written, wraps at 2**32 (was padding)
         ("seq", "<u8"),
         ("last_write_ns", "<u8"),
     ]
@@ -57,6 +60,23 @@ class ShmHandles:
     ctrl: "np.ndarray"
     data: "np.ndarray"
     owner: bool
+    # Pre-bound (1,)-shaped views of ctrl fields; avoids the structured-field lookup per access.
+    seq: "np.ndarray" = field(init=False, repr=False)
+    write_index: "np.ndarray" = field(init=False, repr=False)
+    write_count: "np.ndarray" = field(init=False, repr=False)
+    last_write_ns: "np.ndarray" = field(init=False, repr=False)
+    capacity: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.seq = self.ctrl["seq"]
+        self.write_index = self.ctrl["write_index"]
+        self.write_count = self.ctrl["write_count"]
+        self.last_write_ns = self.ctrl["last_write_ns"]
+        self.capacity = int(self.ctrl["capacity"][0])
+
+
+# Bounded so a producer that died mid-write (odd seq) cannot hang readers.
+_READ_RETRIES = 64
 
 
 def _names(base: str) -> Tuple[str, str]:
@@ -77,6 +97,7 @@ def create_ring(base_name: str, capacity_points: int) -> ShmHandles:
     ctrl["version"][0] = 1
     ctrl["capacity"][0] = capacity_points
     ctrl["write_index"][0] = 0
+    ctrl["write_count"][0] = 0
     ctrl["seq"][0] = 0
     ctrl["last_write_ns"][0] = 0
     data.fill(0)
@@ -152,14 +173,16 @@ def write_points(h: ShmHandles, rows: "np.ndarray") -> None:
     n = int(rows.shape[0])
     if n <= 0:
         return
-    cap = int(h.ctrl["capacity"][0])
-    w = int(h.ctrl["write_index"][0])
+    cap = h.capacity
+    w = int(h.write_index[0])
+    written = n
 
     if n >= cap:
         rows = rows[-cap:]
         n = cap
         w = 0
 
+    h.seq += 1  # odd: write in progress
     end = w + n
     if end <= cap:
         h.data[w:end] = rows
@@ -168,20 +191,82 @@ def write_points(h: ShmHandles, rows: "np.ndarray") -> None:
         h.data[w:cap] = rows[:first]
         h.data[0 : (end - cap)] = rows[first:]
 
-    h.ctrl["write_index"][0] = (w + n) % cap
-    h.ctrl["seq"][0] = int(h.ctrl["seq"][0]) + 1
-    h.ctrl["last_write_ns"][0] = time.time_ns()
+    h.write_index[0] = (w + n) % cap
+    h.write_count[0] = (int(h.write_count[0]) + written) & 0xFFFFFFFF
+    h.last_write_ns[0] = time.time_ns()
+    h.seq += 1  # even: consistent
+
+
+def _read_into(h: ShmHandles, out: "np.ndarray", last_count: Optional[int]) -> Tuple[int, int]:
+    """
+    Copy the newest points into out[:n] (oldest first) under the seqlock.
+    n is capped by len(out) and capacity and, when last_count is given, by the
+    number of points written since then. Returns (n, write_count).
+    """
+    cap = h.capacity
+    limit = min(int(out.shape[0]), cap)
+    n = 0
+    count = int(h.write_count[0])
+
+    for _ in range(_READ_RETRIES):
+        seq0 = int(h.seq[0])
+        if seq0 & 1:
+            continue
+        count = int(h.write_count[0])
+        n = limit if last_count is None else min(limit, (count - last_count) & 0xFFFFFFFF)
+        if n > 0:
+            w = int(h.write_index[0])
+            start = (w - n) % cap
+            if start < w:
+                np.copyto(out[:n], h.data[start:w])
+            else:
+                first = cap - start
+                np.copyto(out[:first], h.data[start:cap])
+                np.copyto(out[first:n], h.data[0:w])
+        if int(h.seq[0]) == seq0:
+            break
+    return n, count
+
+
+def read_latest_into(h: ShmHandles, out: "np.ndarray") -> int:
+    """
+    Copy the newest min(len(out), capacity) points into out[:n] (oldest first)
+    without allocating. Returns n.
+    """
+    return _read_into(h, out, None)[0]
 
 
-def read_latest(h: ShmHandles, max_points: int) -> "np.ndarray":
-    cap = int(h.ctrl["capacity"][0])
+def read_since(
+    h: ShmHandles, last_count: Optional[int], max_points: int, out: Optional["np.ndarray"] = None
+) -> Tuple["np.ndarray", int]:
+    """
+    Return (points written since `last_count`, capped to the newest max_points;
+    current write_count). Pass the returned count back on the next call; pass
+    None to start (same as read_latest). Lets a consumer keep its own window and
+    move only the delta.
+    """
     if max_points <= 0:
-        return h.data[:0].copy()
-    max_points = min(int(max_points), cap)
-    w = int(h.ctrl["write_index"][0])
+        return h.data[:0].copy(), int(h.write_count[0])
+    max_points = min(int(max_points), h.capacity)
+    if out is None:
+        out = np.empty((max_points,), dtype=h.data.dtype)
+    n, count = _read_into(h, out[:max_points], last_count)
+    return out[:n], count
 
-    start = (w - max_points) % cap
-    if start < w:
-        return h.data[start:w].copy()
-    return np.concatenate([h.data[start:cap], h.data[0:w]]).copy()
 
+def read_latest(h: ShmHandles, max_points: int, out: Optional["np.ndarray"] = None) -> "np.ndarray":
+    """
+    Return the newest max_points points (oldest first).
+
+    Without `out` a new array is returned. With `out` (dtype matching the ring),
+    the points are copied into it and a view out[:n] is returned, so a polling
+    consumer can reuse one buffer across reads.
+    """
+    cap = h.capacity
+    if max_points <= 0:
+        return h.data[:0].copy() if out is None else out[:0]
+    max_points = min(int(max_points), cap)
+    if out is None:
+        out = np.empty((max_points,), dtype=h.data.dtype)
+    n = read_latest_into(h, out[:max_points])
+    return out[:n]
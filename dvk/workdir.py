@@ -16,8 +16,10 @@ Override:
 from __future__ import annotations
 
 import os
+import time
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -25,18 +27,47 @@ from typing import Optional
 PROJECT_SLUG = "Device-Verification-Kit"
 
 
-def default_workdir_root() -> Path:
-    return Path(os.environ.get("DVK_WORKDIR", str(Path.home() / "DVK_Workspaces"))).expanduser()
+@lru_cache(maxsize=8)
+def _workdir_root_for(env_workdir: Optional[str]) -> Path:
+    if env_workdir is None:
+        env_workdir = str(Path.home() / "DVK_Workspaces")
+    return Path(env_workdir).expanduser()
 
 
-def project_workdir_root(workdir_root: Optional[Path] = None) -> Path:
-    root = (workdir_root or default_workdir_root()).expanduser().resolve()
+def default_workdir_root() -> Path:
+    # Keyed on the env value, so changing DVK_WORKDIR in-process still takes effect.
+    return _workdir_root_for(os.environ.get("DVK_WORKDIR"))
+
+
+@lru_cache(maxsize=32)
+def _project_workdir_root(root: Path, cwd: Optional[str], resolve_symlinks: bool) -> Path:
+    root = root.expanduser()
+    if resolve_symlinks:
+        root = root.resolve()
+    else:
+        # Lexical normalization only; no per-component lstat/readlink.
+        root = Path(os.path.abspath(root))
     return root / PROJECT_SLUG
 
 
+def project_workdir_root(workdir_root: Optional[Path] = None, *, resolve_symlinks: bool = False) -> Path:
+    root = workdir_root or default_workdir_root()
+    # Relative roots resolve against the cwd, so it is part of the cache key for them.
+    return _project_workdir_root(root, None if root.is_absolute() else os.getcwd(), resolve_symlinks)
+
+
+def clear_workdir_cache() -> None:
+    """Drop memoized workdir paths (e.g. after HOME changes or workdir symlinks are re-pointed)."""
+    _workdir_root_for.cache_clear()
+    _project_workdir_root.cache_clear()
+
+
 def new_run_id(now: Optional[datetime] = None) -> str:
-    dt = now or datetime.now()
-    return dt.strftime("%Y%m%d-%H%M%S")
+    if now is not None:
+        return now.strftime("%Y%m%d-%H%M%S")
+    # Same local-time format without building a datetime or parsing a format string.
+    t = time.localtime()
+    return "%04d%02d%02d-%02d%02d%02d" % (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec)
 
 
 def device_root(device_id: str, *, workdir_root: Optional[Path] = None) -> Path:
@@ -69,11 +100,15 @@ def run_paths(device_id: str, *, run_id: Optional[str] = None, workdir_root: Opt
 
 def latest_run_id(device_id: str, *, workdir_root: Optional[Path] = None) -> Optional[str]:
     runs_dir = device_root(str(device_id), workdir_root=workdir_root) / "runs"
-    if not runs_dir.exists():
-        return None
-    candidates = [p for p in runs_dir.iterdir() if p.is_dir()]
-    if not candidates:
+    # Single pass; DirEntry.is_dir() reuses the type from the directory listing (no stat per entry
+    # except for symlinks, which are still followed as before).
+    best: Optional[str] = None
+    try:
+        with os.scandir(runs_dir) as it:
+            for entry in it:
+                if entry.is_dir() and (best is None or entry.name > best):
+                    best = entry.name
+    except FileNotFoundError:
         return None
-    candidates.sort(key=lambda p: p.name)
-    return candidates[-1].name
+    return best
 
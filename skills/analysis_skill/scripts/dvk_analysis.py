@@ -15,110 +15,92 @@ import shutil
 import subprocess
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 
+@lru_cache(maxsize=None)
 def find_dvk_root(start: Path) -> Path:
     """Find DVK root by locating .claude-plugin/plugin.json marker file."""
-    current = start.resolve()
-    for parent in [current, *current.parents]:
-        if (parent / ".claude-plugin" / "plugin.json").exists():
-            return parent
+    current = str(start.resolve())
+    while True:
+        if os.path.isfile(os.path.join(current, ".claude-plugin", "plugin.json")):
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
     raise SystemExit("Cannot locate DVK root (missing .claude-plugin/plugin.json)")
 
 
+def _dvk_root_on_path() -> Path:
+    # Locate the repo once and make `dvk` importable; repeated calls do not stack sys.path entries.
+    dvk_root = find_dvk_root(Path(__file__).parent)
+    if str(dvk_root) not in sys.path:
+        sys.path.insert(0, str(dvk_root))
+    return dvk_root
+
+
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
-def write_text(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+_DECODED_NAMES = ("decoded.parquet", "decoded.csv", "decoded.json", "decoded.jsonl")
 
 
-def detect_decoded_input(dvk_root: Path, device_id: str) -> Optional[Path]:
-    base = dvk_root / "data" / "processed" / device_id
-    candidates = [
-        base / "decoded.parquet",
-        base / "decoded.csv",
-        base / "decoded.json",
-    ]
-    for c in candidates:
-        if c.exists():
-            return c
+def _find_first(parent: Path, names: Sequence[str]) -> Optional[Path]:
+    """Return parent/<name> for the first name present, listing the directory once instead of stat-ing each."""
+    try:
+        with os.scandir(parent) as it:
+            present = {e.name for e in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    for name in names:
+        if name in present:
+            return parent / name
     return None
 
 
-def notebook_template(
-    template: str,
-    device_id: str,
-    decoded_path: str,
-    *,
-    dvk_code_root: Path,
-    analysis_dir: Path,
-    processed_dir: Path,
-) -> Dict[str, Any]:
-    figures_dir = analysis_dir / "figures"
-    cleaned_path = processed_dir / "cleaned.parquet"
-    metrics_path = analysis_dir / "metrics.csv"
-    anomalies_path = analysis_dir / "anomalies.csv"
+def detect_decoded_input(dvk_root: Path, device_id: str) -> Optional[Path]:
+    return _find_first(dvk_root / "data" / "processed" / device_id, _DECODED_NAMES)
 
-    def md_cell(source: str) -> Dict[str, Any]:
-        return {"cell_type": "markdown", "metadata": {}, "source": source.splitlines(True)}
 
-    def code_cell(source: str) -> Dict[str, Any]:
-        return {"cell_type": "code", "metadata": {}, "execution_count": None, "outputs": [], "source": source.splitlines(True)}
+@lru_cache(maxsize=None)
+def _split_source(source: str) -> Tuple[str, ...]:
+    # Template bodies are mostly constant literals; split each once per process.
+    # Tuples keep the shared result immutable (json writes them as arrays).
+    return tuple(source.splitlines(True))
+
+
+def _md_cell(source: str) -> Dict[str, Any]:
+    return {"cell_type": "markdown", "metadata": {}, "source": _split_source(source)}
+
+
+def _code_cell(source: str) -> Dict[str, Any]:
+    return {"cell_type": "code", "metadata": {}, "execution_count": None, "outputs": [], "source": _split_source(source)}
 
-    base_cells: List[Dict[str, Any]] = [
-        md_cell(
-            f"# DVK Analysis ({template})\n\n"
-            f"- device_id: `{device_id}`\n"
-            f"- input: `{decoded_path}`\n"
-            f"- figures_dir: `{figures_dir}`\n"
-        ),
-        md_cell("## 0) Setup"),
-        code_cell(
-            "import pandas as pd\n"
-            "import numpy as np\n"
-            "import matplotlib.pyplot as plt\n"
-            "import seaborn as sns\n"
-            "from pathlib import Path\n"
-            "sns.set_theme(style='whitegrid')\n"
-        ),
-        code_cell(
-            f"INPUT = r\"{decoded_path}\"\n"
-            f"FIG_DIR = Path(r\"{str(figures_dir)}\")\n"
-            "FIG_DIR.mkdir(parents=True, exist_ok=True)\n"
-            "INPUT\n"
-        ),
-        md_cell("## 1) Load data"),
-        code_cell(
-            "if INPUT.lower().endswith('.parquet'):\n"
-            "    df = pd.read_parquet(INPUT)\n"
-            "elif INPUT.lower().endswith('.csv'):\n"
-            "    df = pd.read_csv(INPUT)\n"
-            "else:\n"
-            "    df = pd.read_json(INPUT, lines=False)\n"
-            "df.head()\n"
-        ),
-    ]
 
-    eda_cells: List[Dict[str, Any]] = [
-        md_cell("## EDA: basic profiling"),
-        code_cell(
+# Shared by the anomaly and viz groups.
+_NUM_COLS_SRC = "num_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]\n"
+
+
+def _eda_cells() -> List[Dict[str, Any]]:
+    return [
+        _md_cell("## EDA: basic profiling"),
+        _code_cell(
             "df.shape\n"
             "\n"
             "df.dtypes\n"
             "\n"
             "df.isna().mean().sort_values(ascending=False).head(20)\n"
         ),
-        md_cell("## EDA: distributions (choose key columns)"),
-        code_cell(
+        _md_cell("## EDA: distributions (choose key columns)"),
+        _code_cell(
             "NUM_COLS = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]\n"
             "NUM_COLS[:10]\n"
         ),
-        code_cell(
+        _code_cell(
             "col = NUM_COLS[0] if NUM_COLS else None\n"
             "if col:\n"
             "    plt.figure(figsize=(10,4))\n"
@@ -131,63 +113,67 @@ def notebook_template(
         ),
     ]
 
-    cleaning_cells: List[Dict[str, Any]] = [
-        md_cell("## Cleaning: define rules (do not guess)"),
-        md_cell(
+
+def _cleaning_cells(cleaned_path: str) -> List[Dict[str, Any]]:
+    return [
+        _md_cell("## Cleaning: define rules (do not guess)"),
+        _md_cell(
             "- Missing values: drop/fill?\n"
             "- Outliers: tag vs remove?\n"
             "- Duplicates: which keys?\n"
             "- Time alignment: which column is time?\n"
         ),
-        code_cell(
+        _code_cell(
             "# TODO: implement your cleaning rules here\n"
             "df_clean = df.copy()\n"
             "df_clean.head()\n"
         ),
-        md_cell("## Cleaning: save cleaned dataset"),
-        code_cell(
-            f"CLEANED_OUT = r\"{str(cleaned_path)}\"\n"
-            "Path(CLEANED_OUT).parent.mkdir(parents=True, exist_ok=True)\n"
+        _md_cell("## Cleaning: save cleaned dataset"),
+        _code_cell(
+            f"CLEANED_OUT = r\"{cleaned_path}\"\n"
             "df_clean.to_parquet(CLEANED_OUT, index=False)\n"
             "CLEANED_OUT\n"
         ),
     ]
 
-    metrics_cells: List[Dict[str, Any]] = [
-        md_cell("## Metrics: load cleaned dataset if available"),
-        code_cell(
-            f"CLEANED = r\"{str(cleaned_path)}\"\n"
+
+def _metrics_cells(cleaned_path: str, metrics_path: str) -> List[Dict[str, Any]]:
+    return [
+        _md_cell("## Metrics: load cleaned dataset if available"),
+        _code_cell(
+            f"CLEANED = r\"{cleaned_path}\"\n"
             "if Path(CLEANED).exists():\n"
             "    dfm = pd.read_parquet(CLEANED)\n"
             "else:\n"
             "    dfm = df\n"
             "dfm.shape\n"
         ),
-        md_cell("## Metrics: define metrics + thresholds (do not guess)"),
-        code_cell(
+        _md_cell("## Metrics: define metrics + thresholds (do not guess)"),
+        _code_cell(
             "# Example: mean/std for numeric columns\n"
             "num_cols = [c for c in dfm.columns if pd.api.types.is_numeric_dtype(dfm[c])]\n"
             "summary = dfm[num_cols].describe().T\n"
             "summary.head()\n"
         ),
-        md_cell("## Metrics: export"),
-        code_cell(
-            f"METRICS_OUT = r\"{str(metrics_path)}\"\n"
-            "Path(METRICS_OUT).parent.mkdir(parents=True, exist_ok=True)\n"
+        _md_cell("## Metrics: export"),
+        _code_cell(
+            f"METRICS_OUT = r\"{metrics_path}\"\n"
             "summary.to_csv(METRICS_OUT)\n"
             "METRICS_OUT\n"
         ),
     ]
 
-    anomaly_cells: List[Dict[str, Any]] = [
-        md_cell("## Anomaly detection: pick signals + definition"),
-        code_cell(
+
+def _anomaly_cells(anomalies_path: str) -> List[Dict[str, Any]]:
+    return [
+        _md_cell("## Anomaly detection: pick signals + definition"),
+        _code_cell(
             "# TODO: define anomaly rules. Example below: z-score on a chosen column\n"
-            "num_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]\n"
-            "target = num_cols[0] if num_cols else None\n"
+            + _NUM_COLS_SRC
+            + "target = num_cols[0] if num_cols else None\n"
             "target\n"
         ),
-        code_cell(
+        _code_cell(
             "if target:\n"
             "    s = df[target].astype(float)\n"
             "    z = (s - s.mean()) / (s.std() + 1e-12)\n"
@@ -196,22 +182,23 @@ def notebook_template(
             "    anomalies = df.iloc[0:0].copy()\n"
             "anomalies.head()\n"
         ),
-        md_cell("## Anomaly detection: export list"),
-        code_cell(
-            f"ANOM_OUT = r\"{str(anomalies_path)}\"\n"
-            "Path(ANOM_OUT).parent.mkdir(parents=True, exist_ok=True)\n"
+        _md_cell("## Anomaly detection: export list"),
+        _code_cell(
+            f"ANOM_OUT = r\"{anomalies_path}\"\n"
             "anomalies.to_csv(ANOM_OUT, index=False)\n"
             "ANOM_OUT\n"
         ),
     ]
 
-    viz_cells: List[Dict[str, Any]] = [
-        md_cell("## Visualization: time series / correlations (choose columns)"),
-        code_cell(
-            "num_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]\n"
-            "num_cols[:10]\n"
+
+def _viz_cells() -> List[Dict[str, Any]]:
+    return [
+        _md_cell("## Visualization: time series / correlations (choose columns)"),
+        _code_cell(
+            _NUM_COLS_SRC
+            + "num_cols[:10]\n"
         ),
-        code_cell(
+        _code_cell(
             "if len(num_cols) >= 2:\n"
             "    x, y = num_cols[0], num_cols[1]\n"
             "    plt.figure(figsize=(6,6))\n"
@@ -223,16 +210,83 @@ def notebook_template(
         ),
     ]
 
-    templates: Dict[str, List[Dict[str, Any]]] = {
-        "eda": eda_cells,
-        "cleaning": cleaning_cells,
-        "metrics": metrics_cells,
-        "anomaly": anomaly_cells,
-        "viz": viz_cells,
-        "full": eda_cells + cleaning_cells + metrics_cells + anomaly_cells + viz_cells,
+
+# Argument-independent base cells, built once at import and shared by every
+# notebook_template() call. Treat as read-only (they are only serialized).
+_STATIC_SETUP_CELLS: Tuple[Dict[str, Any], ...] = (
+    _md_cell("## 0) Setup"),
+    _code_cell(
+        "import pandas as pd\n"
+        "import numpy as np\n"
+        "import matplotlib.pyplot as plt\n"
+        "import seaborn as sns\n"
+        "from pathlib import Path\n"
+        "sns.set_theme(style='whitegrid')\n"
+    ),
+)
+
+_STATIC_LOAD_CELLS: Tuple[Dict[str, Any], ...] = (
+    _md_cell("## 1) Load data"),
+    _code_cell(
+        "if INPUT.lower().endswith('.parquet'):\n"
+        "    df = pd.read_parquet(INPUT)\n"
+        "elif INPUT.lower().endswith('.csv'):\n"
+        "    df = pd.read_csv(INPUT)\n"
+        "elif INPUT.lower().endswith('.jsonl'):\n"
+        "    df = pd.read_json(INPUT, lines=True)\n"
+        "else:\n"
+        "    df = pd.read_json(INPUT, lines=False)\n"
+        "df.head()\n"
+    ),
+)
+
+
+def notebook_template(
+    template: str,
+    device_id: str,
+    decoded_path: str,
+    *,
+    dvk_code_root: Path,
+    analysis_dir: Path,
+    processed_dir: Path,
+) -> Dict[str, Any]:
+    # Render each path to text once; cells below only interpolate strings.
+    figures_dir = str(analysis_dir / "figures")
+    cleaned_path = str(processed_dir / "cleaned.parquet")
+    metrics_path = str(analysis_dir / "metrics.csv")
+    anomalies_path = str(analysis_dir / "anomalies.csv")
+
+    # Only the title and path cells depend on the arguments; the rest are shared.
+    base_cells: List[Dict[str, Any]] = [
+        _md_cell(
+            f"# DVK Analysis ({template})\n\n"
+            f"- device_id: `{device_id}`\n"
+            f"- input: `{decoded_path}`\n"
+            f"- figures_dir: `{figures_dir}`\n"
+        ),
+        *_STATIC_SETUP_CELLS,
+        _code_cell(
+            f"INPUT = r\"{decoded_path}\"\n"
+            f"FIG_DIR = Path(r\"{figures_dir}\")\n"
+            "INPUT\n"
+        ),
+        *_STATIC_LOAD_CELLS,
+    ]
+
+    # Only the selected group(s) are built.
+    builders: Dict[str, Callable[[], List[Dict[str, Any]]]] = {
+        "eda": _eda_cells,
+        "cleaning": lambda: _cleaning_cells(cleaned_path),
+        "metrics": lambda: _metrics_cells(cleaned_path, metrics_path),
+        "anomaly": lambda: _anomaly_cells(anomalies_path),
+        "viz": _viz_cells,
     }
+    if template == "full":
+        group_cells = [c for build in builders.values() for c in build()]
+    else:
+        group_cells = builders.get(template, _eda_cells)()
 
-    cells = base_cells + templates.get(template, eda_cells)
+    cells = base_cells + group_cells
 
     return {
         "cells": [
@@ -257,39 +311,52 @@ def cmd_check_env(_: argparse.Namespace) -> None:
         "jupyter": {},
     }
 
+    # Presence check only: find_spec locates the module without executing it
+    # (importing pandas/matplotlib here would cost seconds and tens of MB).
+    from importlib.util import find_spec
+
     required = ["pandas", "numpy", "matplotlib", "seaborn", "jupyter"]
     for mod in required:
         try:
-            __import__(mod)
-            report["packages"][mod] = "ok"
+            found = find_spec(mod) is not None
         except Exception as e:
             report["packages"][mod] = f"missing: {e}"
+            continue
+        report["packages"][mod] = "ok" if found else f"missing: No module named '{mod}'"
 
     jupyter_bin = shutil.which("jupyter")
     report["jupyter"]["bin"] = jupyter_bin
-    if jupyter_bin:
+
+    # Versions are read in-process (package metadata, else the module attribute);
+    # no `jupyter --version` subprocess.
+    from importlib.metadata import PackageNotFoundError, version
+
+    versions: Dict[str, str] = {}
+    for pkg in ("jupyter_core", "jupyterlab", "notebook"):
         try:
-            out = subprocess.check_output([jupyter_bin, "--version"], stderr=subprocess.STDOUT, text=True)
-            report["jupyter"]["version"] = out.strip()
+            versions[pkg] = version(pkg)
+        except PackageNotFoundError:
+            continue
         except Exception as e:
-            report["jupyter"]["version_error"] = str(e)
+            versions[pkg] = f"error: {e}"
+    if versions:
+        report["jupyter"]["versions"] = versions
     else:
-        # On Windows, `python -m jupyter` may work even if `jupyter.exe` isn't on PATH.
         try:
-            out = subprocess.check_output([sys.executable, "-m", "jupyter", "--version"], stderr=subprocess.STDOUT, text=True)
-            report["jupyter"]["python_module_version"] = out.strip()
+            import jupyter_core  # type: ignore
+
+            report["jupyter"]["version"] = jupyter_core.__version__
         except Exception as e:
-            report["jupyter"]["python_module_version_error"] = str(e)
+            report["jupyter"]["version_error"] = repr(e)
 
     print(json.dumps(report, ensure_ascii=False, indent=2))
 
 
 def cmd_init(args: argparse.Namespace) -> None:
-    dvk_root = find_dvk_root(Path(__file__).parent)
+    dvk_root = _dvk_root_on_path()
     device_id = args.device_id
 
     # Private workdir (default): %USERPROFILE%/DVK_Workspaces
-    sys.path.insert(0, str(dvk_root))
     from dvk.workdir import default_workdir_root, latest_run_id, run_paths  # type: ignore
 
     workdir_root = Path(args.workdir).expanduser() if getattr(args, "workdir", None) else default_workdir_root()
@@ -298,25 +365,24 @@ def cmd_init(args: argparse.Namespace) -> None:
 
     decoded = Path(args.input) if args.input else None
     if decoded is None:
-        candidates = [
-            run.processed_dir / "decoded.parquet",
-            run.processed_dir / "decoded.csv",
-            run.processed_dir / "decoded.json",
-        ]
-        decoded = next((c for c in candidates if c.exists()), None) or detect_decoded_input(dvk_root, device_id)
+        decoded = _find_first(run.processed_dir, _DECODED_NAMES) or detect_decoded_input(dvk_root, device_id)
     if decoded is None:
         raise SystemExit(
             "Decoded input not found. Provide --input or create one of:\n"
             f"  {run.processed_dir / 'decoded.parquet'}\n"
             f"  {run.processed_dir / 'decoded.csv'}\n"
             f"  {run.processed_dir / 'decoded.json'}\n"
+            f"  {run.processed_dir / 'decoded.jsonl'}\n"
         )
 
     analysis_dir = run.reports_dir / "analysis"
     notebooks_dir = analysis_dir / "notebooks"
     figures_dir = analysis_dir / "figures"
-    notebooks_dir.mkdir(parents=True, exist_ok=True)
-    figures_dir.mkdir(parents=True, exist_ok=True)
+    # Every output folder the notebook writes to is created here, once; the generated
+    # cells do not mkdir again (figures/metrics/anomalies under analysis_dir, cleaned data
+    # under processed_dir).
+    for d in (notebooks_dir, figures_dir, run.processed_dir):
+        d.mkdir(parents=True, exist_ok=True)
 
     template = args.template
     nb_name_map = {
@@ -339,23 +405,27 @@ def cmd_init(args: argparse.Namespace) -> None:
         analysis_dir=analysis_dir,
         processed_dir=run.processed_dir,
     )
-    nb_path.write_text(json.dumps(nb, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Machine-generated; compact separators skip the indent pass unless --pretty is asked for.
+    if getattr(args, "pretty", False):
+        text = json.dumps(nb, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(nb, ensure_ascii=False, separators=(",", ":"))
+    nb_path.write_text(text, encoding="utf-8")
 
     summary = analysis_dir / "summary.md"
     if not summary.exists():
-        write_text(
-            summary,
+        summary.write_text(
             f"# DVK Analysis Summary\n\n- device_id: `{device_id}`\n- created_at: `{datetime.now().isoformat(timespec='seconds')}`\n- input: `{decoded}`\n\n## Findings\n\n- \n",
+            encoding="utf-8",
         )
 
     print(str(nb_path))
 
 
 def cmd_launch(args: argparse.Namespace) -> None:
-    dvk_root = find_dvk_root(Path(__file__).parent)
+    _dvk_root_on_path()
     device_id = args.device_id
 
-    sys.path.insert(0, str(dvk_root))
     from dvk.workdir import default_workdir_root, latest_run_id, run_paths  # type: ignore
 
     workdir_root = Path(args.workdir).expanduser() if getattr(args, "workdir", None) else default_workdir_root()
@@ -400,6 +470,7 @@ def build_parser() -> argparse.ArgumentParser:
         default="eda",
         help="Notebook template to generate",
     )
+    init.add_argument("--pretty", action="store_true", help="Indent the notebook JSON (default: compact)")
     init.set_defaults(func=cmd_init)
 
     launch = sub.add_parser("launch", help="Launch Jupyter in the analysis notebooks folder")
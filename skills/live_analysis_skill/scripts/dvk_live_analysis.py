@@ -13,25 +13,46 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 
+@lru_cache(maxsize=None)
 def find_dvk_root(start: Path) -> Path:
-    current = start.resolve()
-    for parent in [current, *current.parents]:
-        if (parent / ".claude-plugin" / "plugin.json").exists():
-            return parent
+    current = str(start.resolve())
+    while True:
+        if os.path.isfile(os.path.join(current, ".claude-plugin", "plugin.json")):
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
     raise SystemExit("Cannot locate DVK root (missing .claude-plugin/plugin.json)")
 
 
+def _dvk_root_on_path() -> Path:
+    # Locate the repo once and make `dvk` importable; repeated calls do not stack sys.path entries.
+    dvk_root = find_dvk_root(Path(__file__).parent)
+    if str(dvk_root) not in sys.path:
+        sys.path.insert(0, str(dvk_root))
+    return dvk_root
+
+
+@lru_cache(maxsize=None)
+def _split_source(source: str) -> Tuple[str, ...]:
+    # Static cell bodies are split once per process; tuples keep the shared result immutable.
+    return tuple(source.splitlines(True))
+
+
 def _md_cell(text: str) -> Dict[str, Any]:
-    return {"cell_type": "markdown", "metadata": {}, "source": text.splitlines(True)}
+    return {"cell_type": "markdown", "metadata": {}, "source": _split_source(text)}
 
 
 def _code_cell(code: str) -> Dict[str, Any]:
-    return {"cell_type": "code", "metadata": {}, "execution_count": None, "outputs": [], "source": code.splitlines(True)}
+    return {"cell_type": "code", "metadata": {}, "execution_count": None, "outputs": [], "source": _split_source(code)}
 
 
 def build_live_notebook(*, device_id: str, dvk_code_root: Path) -> Dict[str, Any]:
@@ -52,145 +73,18 @@ except Exception as e:
     print("Fix: ensure `jupyter-notebook-mcp/src` is on PYTHONPATH for this kernel, then restart the notebook server.")
 """
 
-    live = f"""import time
-import numpy as np
-from IPython.display import display
-import sys
+    # The loop lives in dvk.live_viewer (compiled once, cached in __pycache__);
+    # the cell only makes `dvk` importable and calls it.
+    live = f"""import sys
 from pathlib import Path
 
 DVK_CODE_ROOT = Path(r\"{str(dvk_code_root.resolve())}\")
-sys.path.insert(0, str(DVK_CODE_ROOT))
+if str(DVK_CODE_ROOT) not in sys.path:
+    sys.path.insert(0, str(DVK_CODE_ROOT))
 
-from dvk.shm import attach_ring, read_latest
+from dvk.live_viewer import run_live
 
-BASE = 'dvk.{device_id}'
-
-def wait_attach(name: str, timeout_s: float = 30.0, poll_s: float = 0.2):
-    t0 = time.time()
-    last_err = None
-    while time.time() - t0 < timeout_s:
-        try:
-            return attach_ring(name)
-        except FileNotFoundError as e:
-            last_err = e
-            time.sleep(poll_s)
-    raise RuntimeError(
-        f"SharedMemory '{{name}}' not found (waited {{timeout_s}}s). "
-        "Start a publisher to create it, then retry."
-    ) from last_err
-
-h = wait_attach(BASE)
-
-MAX_POINTS = 20000
-FPS = 6
-
-# If the publisher restarts with --overwrite-shm, the consumer may hold stale SHM handles.
-# We re-attach when the writer's seq/last_write_ns stops moving for a while.
-stale_ticks = 0
-last_seq_seen = -1
-last_ns_seen = -1
-
-# Preferred: Plotly (mature, WebGL Scattergl). Fallback: matplotlib.
-try:
-    import plotly.graph_objects as go
-
-    fig = go.FigureWidget(
-        data=[
-            go.Scattergl(x=[], y=[], mode='markers', marker=dict(size=2))
-        ],
-        layout=go.Layout(
-            title='Live 2D point cloud',
-            xaxis=dict(scaleanchor='y', scaleratio=1),
-            yaxis=dict(),
-            margin=dict(l=20, r=20, t=40, b=20),
-        ),
-    )
-    display(fig)
-
-    for _ in range(10_000):
-        seq = int(h.ctrl['seq'][0])
-        ns = int(h.ctrl['last_write_ns'][0])
-        if seq == last_seq_seen and ns == last_ns_seen:
-            stale_ticks += 1
-        else:
-            stale_ticks = 0
-            last_seq_seen, last_ns_seen = seq, ns
-        if stale_ticks >= int(FPS * 2):
-            try:
-                h = attach_ring(BASE)
-            except Exception:
-                pass
-            stale_ticks = 0
-
-        pts = read_latest(h, MAX_POINTS)
-        if len(pts) > 0:
-            with fig.batch_update():
-                fig.data[0].x = pts['x'].astype(float)
-                fig.data[0].y = pts['y'].astype(float)
-                fig.layout.title = f'Live 2D point cloud (n={{len(pts)}}, seq={{seq}})'
-                fig.layout.xaxis.autorange = True
-                fig.layout.yaxis.autorange = True
-        else:
-            with fig.batch_update():
-                fig.data[0].x = []
-                fig.data[0].y = []
-                fig.layout.title = f'Live 2D point cloud (waiting..., seq={{seq}})'
-        time.sleep(1.0 / FPS)
-except Exception:
-    import matplotlib.pyplot as plt
-
-    # If you have ipympl installed, widget backend may improve smoothness.
-    try:
-        get_ipython().run_line_magic('matplotlib', 'widget')
-    except Exception:
-        pass
-
-    plt.ioff()
-    fig, ax = plt.subplots(figsize=(7,7))
-    sc = ax.scatter([], [], s=1)
-    ax.set_aspect('equal', adjustable='box')
-    ax.grid(True)
-    handle = display(fig, display_id=True)
-
-    last_seq = -1
-    for _ in range(10_000):
-        seq = int(h.ctrl['seq'][0])
-        ns = int(h.ctrl['last_write_ns'][0])
-        if seq == last_seq_seen and ns == last_ns_seen:
-            stale_ticks += 1
-        else:
-            stale_ticks = 0
-            last_seq_seen, last_ns_seen = seq, ns
-        if stale_ticks >= int(FPS * 2):
-            try:
-                h = attach_ring(BASE)
-            except Exception:
-                pass
-            stale_ticks = 0
-
-        pts = read_latest(h, MAX_POINTS)
-        if len(pts) > 0:
-            xs = pts["x"].astype(float)
-            ys = pts["y"].astype(float)
-            sc.set_offsets(np.c_[xs, ys])
-            ax.set_title(f'Live 2D point cloud (n={{len(pts)}}, seq={{seq}})')
-            xmin, xmax = float(np.min(xs)), float(np.max(xs))
-            ymin, ymax = float(np.min(ys)), float(np.max(ys))
-            span = max(xmax - xmin, ymax - ymin)
-            pad = span * 0.05
-            if not np.isfinite(pad) or pad <= 0:
-                pad = 1.0
-            ax.set_xlim(xmin - pad, xmax + pad)
-            ax.set_ylim(ymin - pad, ymax + pad)
-        else:
-            sc.set_offsets(np.zeros((0, 2), dtype=np.float32))
-            ax.set_title(f'Live 2D point cloud (waiting..., seq={{seq}})')
-
-        if seq != last_seq:
-            handle.update(fig)
-            last_seq = seq
-
-        time.sleep(1.0 / FPS)
+run_live({device_id!r}, max_points=20000, fps=6)
 """
 
     cells: List[Dict[str, Any]] = [
@@ -241,8 +135,7 @@ print('x==0 %', float(np.mean(x==0))*100.0)
 
 
 def cmd_init(args: argparse.Namespace) -> None:
-    dvk_root = find_dvk_root(Path(__file__).parent)
-    sys.path.insert(0, str(dvk_root))
+    dvk_root = _dvk_root_on_path()
     from dvk.workdir import default_workdir_root, device_root  # type: ignore
 
     workdir_root = Path(args.workdir).expanduser() if args.workdir else default_workdir_root()
@@ -250,7 +143,12 @@ def cmd_init(args: argparse.Namespace) -> None:
     out_name = str(args.out_name or "live.ipynb")
     out = device_root(args.device_id, workdir_root=workdir_root) / "live" / "notebooks" / out_name
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(json.dumps(nb, ensure_ascii=False, indent=1), encoding="utf-8")
+    # Machine-generated; compact separators skip the indent pass unless --pretty is asked for.
+    if args.pretty:
+        text = json.dumps(nb, ensure_ascii=False, indent=1)
+    else:
+        text = json.dumps(nb, ensure_ascii=False, separators=(",", ":"))
+    out.write_text(text, encoding="utf-8")
     print(str(out))
 
 
@@ -261,6 +159,7 @@ def main() -> int:
     p_init.add_argument("--device-id", required=True)
     p_init.add_argument("--workdir", help="Workdir root (default: ~/DVK_Workspaces or env DVK_WORKDIR)")
     p_init.add_argument("--out-name", dest="out_name", help="Notebook file name under <device>/live/notebooks/")
+    p_init.add_argument("--pretty", action="store_true", help="Indent the notebook JSON (default: compact)")
     p_init.set_defaults(func=cmd_init)
 
     args = ap.parse_args()
@@ -10,20 +10,26 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import mmap
 import os
 import struct
 import time
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, BinaryIO, Dict, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 
 def find_dvk_root(start: Path) -> Path:
     """Find DVK root by locating .claude-plugin/plugin.json marker file."""
-    current = start.resolve()
-    for parent in [current, *current.parents]:
-        if (parent / ".claude-plugin" / "plugin.json").exists():
-            return parent
+    current = str(start.resolve())
+    while True:
+        if os.path.isfile(os.path.join(current, ".claude-plugin", "plugin.json")):
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
     raise SystemExit("Cannot locate DVK root (missing .claude-plugin/plugin.json)")
 
 
@@ -32,51 +38,53 @@ def load_yaml_optional(path: Path) -> Optional[dict]:
         import yaml  # type: ignore
     except Exception:
         return None
+    # libyaml-backed loader when PyYAML was built with it (same safe subset, parsed in C).
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     try:
-        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        return yaml.load(path.read_text(encoding="utf-8"), Loader=loader) or {}
     except FileNotFoundError:
         return None
 
 
+@lru_cache(maxsize=32)
+def _load_protocol_cached(path: str, mtime_ns: int) -> dict:
+    # Keyed on mtime so an edited protocol.json is re-read; callers treat the dict as read-only.
+    with open(path, "rb") as f:
+        return json.loads(f.read())
+
+
 def load_protocol(protocol_path: Path) -> dict:
     try:
-        return json.loads(protocol_path.read_text(encoding="utf-8"))
+        return _load_protocol_cached(str(protocol_path), os.stat(protocol_path).st_mtime_ns)
     except FileNotFoundError:
         raise SystemExit(f"protocol.json not found: {protocol_path}")
     except json.JSONDecodeError as e:
         raise SystemExit(f"Invalid JSON in {protocol_path}: {e}")
 
 
+# Precompiled unpackers per numeric protocol field type; other types are returned as hex.
+_UNPACKERS: Dict[str, struct.Struct] = {
+    "uint8": struct.Struct("B"),
+    "int8": struct.Struct("b"),
+    "uint16_le": struct.Struct("<H"),
+    "uint16_be": struct.Struct(">H"),
+    "int16_le": struct.Struct("<h"),
+    "int16_be": struct.Struct(">h"),
+    "uint32_le": struct.Struct("<I"),
+    "uint32_be": struct.Struct(">I"),
+    "int32_le": struct.Struct("<i"),
+    "int32_be": struct.Struct(">i"),
+    "float32_le": struct.Struct("<f"),
+    "float32_be": struct.Struct(">f"),
+}
+
+
 def parse_value(data: bytes, value_type: str) -> Any:
     """Parse bytes into typed value based on protocol field type."""
-    if value_type == "uint8":
-        return data[0] if len(data) >= 1 else None
-    elif value_type == "int8":
-        return struct.unpack("b", data[:1])[0] if len(data) >= 1 else None
-    elif value_type == "uint16_le":
-        return struct.unpack("<H", data[:2])[0] if len(data) >= 2 else None
-    elif value_type == "uint16_be":
-        return struct.unpack(">H", data[:2])[0] if len(data) >= 2 else None
-    elif value_type == "int16_le":
-        return struct.unpack("<h", data[:2])[0] if len(data) >= 2 else None
-    elif value_type == "int16_be":
-        return struct.unpack(">h", data[:2])[0] if len(data) >= 2 else None
-    elif value_type == "uint32_le":
-        return struct.unpack("<I", data[:4])[0] if len(data) >= 4 else None
-    elif value_type == "uint32_be":
-        return struct.unpack(">I", data[:4])[0] if len(data) >= 4 else None
-    elif value_type == "int32_le":
-        return struct.unpack("<i", data[:4])[0] if len(data) >= 4 else None
-    elif value_type == "int32_be":
-        return struct.unpack(">i", data[:4])[0] if len(data) >= 4 else None
-    elif value_type == "float32_le":
-        return struct.unpack("<f", data[:4])[0] if len(data) >= 4 else None
-    elif value_type == "float32_be":
-        return struct.unpack(">f", data[:4])[0] if len(data) >= 4 else None
-    elif value_type == "bytes":
-        return data.hex()
-    else:
+    s = _UNPACKERS.get(value_type)
+    if s is None:
         return data.hex()
+    return s.unpack_from(data)[0] if len(data) >= s.size else None
 
 
 def resolve_field_length(length_spec: Any, record: Dict[str, Any], frame_len: int) -> int:
@@ -103,26 +111,87 @@ class DecodeStats:
     decoded_ok: int = 0
     decode_errors: int = 0
     field_names: List[str] = field(default_factory=list)
+    # Column-wise view of the records, set only by the numpy decode paths
+    # (lets CSV/Parquet output skip the per-row conversion).
+    columns: Optional[Dict[str, List[Any]]] = field(default=None, repr=False)
 
 
-def decode_frame(frame: bytes, frame_spec: dict, record: Dict[str, Any]) -> bool:
-    """Decode a single frame according to frame_spec, populating record dict."""
-    fields = frame_spec.get("fields", [])
+class _FieldOp(NamedTuple):
+    """One frame_spec field with name/offset/type resolved once (see compile_frame_spec)."""
 
-    for field_def in fields:
-        name = field_def["name"]
-        offset = int(field_def["offset"])
-        length = resolve_field_length(field_def["length"], record, len(frame))
-        ftype = field_def["type"]
+    name: str
+    offset: int
+    length: int  # static length; unused when length_fn is set
+    length_fn: Optional[Callable[[Dict[str, Any]], int]]  # non-int length spec, resolved per frame
+    unpacker: Optional[struct.Struct]  # None -> raw bytes as hex
 
+
+def _compile_field_length(length_spec: Any) -> Callable[[Dict[str, Any]], int]:
+    """
+    resolve_field_length() with the spec's ref/mul/add read and coerced once;
+    the returned callable only looks up the referenced field in the record.
+    """
+    if not isinstance(length_spec, dict) or not length_spec.get("ref"):
+        return lambda record: 0
+    ref = length_spec["ref"]
+    try:
+        mul = int(length_spec.get("mul", 1))
+    except Exception:
+        mul = 1
+    try:
+        add = int(length_spec.get("add", 0))
+    except Exception:
+        # Keep resolve_field_length's per-frame error for a malformed "add".
+        return lambda record: resolve_field_length(length_spec, record, 0)
+
+    def length_fn(record: Dict[str, Any]) -> int:
+        return int(record[ref]) * mul + add if ref in record else 0
+
+    return length_fn
+
+
+def compile_frame_spec(frame_spec: dict) -> List[_FieldOp]:
+    """Flatten frame_spec["fields"] once so the per-frame loop does no dict lookups or int() coercions."""
+    ops = []
+    for field_def in frame_spec.get("fields", []):
+        length = field_def["length"]
+        static = isinstance(length, int)
+        ops.append(
+            _FieldOp(
+                name=field_def["name"],
+                offset=int(field_def["offset"]),
+                length=length if static else 0,
+                length_fn=None if static else _compile_field_length(length),
+                unpacker=_UNPACKERS.get(field_def["type"]),
+            )
+        )
+    return ops
+
+
+def decode_frame(
+    frame: bytes, frame_spec: dict, record: Dict[str, Any], ops: Optional[List[_FieldOp]] = None
+) -> bool:
+    """
+    Decode a single frame according to frame_spec, populating record dict.
+    Pass `ops` (compile_frame_spec(frame_spec)) when decoding many frames.
+    """
+    if ops is None:
+        ops = compile_frame_spec(frame_spec)
+    frame_len = len(frame)
+
+    for name, offset, length, length_fn, s in ops:
+        if length_fn is not None:
+            length = length_fn(record)
         if offset < 0:
-            offset = len(frame) + offset
-        if offset < 0 or offset + length > len(frame):
+            offset = frame_len + offset
+        if offset < 0 or offset + length > frame_len:
             return False
 
-        raw = frame[offset:offset + length]
-        value = parse_value(raw, ftype)
-        record[name] = value
+        # Unpack in place; only hex (bytes/unknown) fields need a slice.
+        if s is None:
+            record[name] = frame[offset:offset + length].hex()
+        else:
+            record[name] = s.unpack_from(frame, offset)[0] if length >= s.size else None
 
     return True
 
@@ -138,8 +207,8 @@ def extract_header(frame_spec: dict) -> bytes:
     return bytes(header_bytes)
 
 
-def get_frame_length(frame_spec: dict, data: bytes) -> int:
-    """Determine frame length from length spec."""
+def get_frame_length(frame_spec: dict, data: bytes, start: int = 0) -> int:
+    """Determine frame length from length spec, for a frame beginning at data[start]."""
     length_spec = frame_spec.get("length", {})
     mode = length_spec.get("mode", "fixed")
 
@@ -152,10 +221,11 @@ def get_frame_length(frame_spec: dict, data: bytes) -> int:
         ftype = field_def.get("type", "uint8")
         overhead = length_spec.get("overhead_bytes", 0)
 
-        if len(data) < offset + flen:
+        avail = len(data) - start
+        if avail < offset + flen:
             return -1
 
-        raw = data[offset:offset + flen]
+        raw = _frame_slice(data, start, avail, offset, flen)
         payload_len = parse_value(raw, ftype)
         if payload_len is None:
             return -1
@@ -167,9 +237,10 @@ def get_frame_length(frame_spec: dict, data: bytes) -> int:
         ftype = field_def.get("type", "uint8")
         overhead = length_spec.get("overhead_bytes", 0)
         unit_bytes = length_spec.get("unit_bytes", 0)
-        if len(data) < offset + flen:
+        avail = len(data) - start
+        if avail < offset + flen:
             return -1
-        raw = data[offset:offset + flen]
+        raw = _frame_slice(data, start, avail, offset, flen)
         count = parse_value(raw, ftype)
         if count is None:
             return -1
@@ -178,42 +249,430 @@ def get_frame_length(frame_spec: dict, data: bytes) -> int:
     return -1
 
 
-def decode_frames_file(
-    frames_path: Path,
+def _frame_slice(data: bytes, start: int, avail: int, offset: int, length: int) -> bytes:
+    """data[start:][offset:offset + length] without materializing data[start:]."""
+    lo, hi, _ = slice(offset, offset + length).indices(avail)
+    return data[start + lo:start + max(hi, lo)]
+
+
+# numpy dtype per numeric protocol field type (used by the fixed-layout fast path).
+_NP_FIELD_TYPES: Dict[str, str] = {
+    "uint8": "u1",
+    "int8": "i1",
+    "uint16_le": "<u2",
+    "uint16_be": ">u2",
+    "int16_le": "<i2",
+    "int16_be": ">i2",
+    "uint32_le": "<u4",
+    "uint32_be": ">u4",
+    "int32_le": "<i4",
+    "int32_be": ">i4",
+    "float32_le": "<f4",
+    "float32_be": ">f4",
+}
+
+
+def _decode_fixed_numpy(
+    data: bytes,
+    header: bytes,
     frame_spec: dict,
-    add_frame_index: bool = True,
-    add_timestamp: bool = False
-) -> tuple[List[Dict[str, Any]], DecodeStats]:
-    """Decode all frames from a binary file."""
-    records = []
-    stats = DecodeStats()
+    add_frame_index: bool,
+    add_timestamp: bool,
+) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, List[Any]]]]:
+    """
+    Decode fixed-length frames whose fields all have plain int offsets/lengths
+    through one numpy structured dtype instead of per-field parse_value calls.
+
+    Returns (records, columns): the same records as the per-frame path, plus the
+    same values column-wise. Returns None when numpy is unavailable or the
+    layout is not eligible (the caller then falls back).
+    """
+    length_spec = frame_spec.get("length", {})
+    if length_spec.get("mode", "fixed") != "fixed":
+        return None
+    frame_len = length_spec.get("value", 0)
+    if not isinstance(frame_len, int) or frame_len < max(len(header), 1):
+        return None
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        return None
 
-    header = extract_header(frame_spec)
-    field_names = [f["name"] for f in frame_spec.get("fields", [])]
-    if add_frame_index:
-        field_names = ["_frame_idx"] + field_names
+    # Layout: (dtype field, numpy format, byte offset, length, kind) per protocol field.
+    # kind: "num" -> typed value, "hex" -> raw bytes as hex, "none" -> too short (None).
+    # Only "num" fields go into the structured dtype; hex columns are cut from the raw rows.
+    layout = []
+    for i, field_def in enumerate(frame_spec.get("fields", [])):
+        offset = field_def.get("offset")
+        length = field_def.get("length")
+        if not isinstance(offset, int) or not isinstance(length, int):
+            return None
+        if offset < 0:
+            offset = frame_len + offset
+        if offset < 0 or length < 0 or offset + length > frame_len:
+            return None  # every frame would fail; keep the per-frame error accounting
+        np_type = _NP_FIELD_TYPES.get(field_def["type"])
+        if np_type is None:
+            layout.append((f"f{i}", None, offset, length, "hex"))
+        elif length < np.dtype(np_type).itemsize:
+            layout.append((f"f{i}", None, offset, length, "none"))
+        else:
+            layout.append((f"f{i}", np_type, offset, length, "num"))
+
+    # Frame starts, as the sequential header scan would find them. Contiguous
+    # captures are checked in one vectorized compare; the rest uses bytes.find.
+    starts: List[int] = []
+    first = data.find(header)
+    if first >= 0:
+        n_max = (len(data) - first) // frame_len
+        heads = np.ndarray(
+            (n_max, len(header)), dtype=np.uint8, buffer=data, offset=first, strides=(frame_len, 1)
+        )
+        ok = (heads == np.frombuffer(header, dtype=np.uint8)).all(axis=1)
+        n_run = n_max if ok.all() else int(ok.argmin())
+        pos = first + n_run * frame_len
+        while True:
+            idx = data.find(header, pos)
+            if idx < 0 or idx + frame_len > len(data):
+                break
+            starts.append(idx)
+            pos = idx + frame_len
+    else:
+        n_run = 0
+
+    n = n_run + len(starts)
+    if not starts:
+        arr_bytes = np.ndarray((n_run, frame_len), dtype=np.uint8, buffer=data, offset=max(first, 0))
+    else:
+        u8 = np.frombuffer(data, dtype=np.uint8)
+        idx_arr = np.concatenate(
+            (first + np.arange(n_run, dtype=np.int64) * frame_len, np.asarray(starts, dtype=np.int64))
+        )
+        arr_bytes = u8[idx_arr[:, None] + np.arange(frame_len, dtype=np.int64)]
+
+    typed = [f for f in layout if f[4] == "num"]
+    dtype = np.dtype(
+        {
+            "names": [f[0] for f in typed],
+            "formats": [f[1] for f in typed],
+            "offsets": [f[2] for f in typed],
+            "itemsize": frame_len,
+        }
+    )
+    arr = arr_bytes.reshape(-1).view(dtype) if n else np.zeros((0,), dtype=dtype)
+
+    # Convert to Python values only at the output boundary (one pass per column).
+    keys: List[str] = []
+    columns: List[Any] = []
     if add_timestamp:
-        field_names = ["_timestamp"] + field_names
-    stats.field_names = field_names
+        keys.append("_timestamp")
+        columns.append([None] * n)  # No timestamp source in offline mode
+    if add_frame_index:
+        keys.append("_frame_idx")
+        columns.append(list(range(n)))
+    for (dname, _fmt, offset, length, kind), field_def in zip(layout, frame_spec.get("fields", [])):
+        keys.append(field_def["name"])
+        if kind == "num":
+            columns.append(arr[dname].tolist())
+        elif kind == "hex" and length:
+            text = np.ascontiguousarray(arr_bytes[:, offset : offset + length]).tobytes().hex()
+            step = 2 * length
+            columns.append([text[j : j + step] for j in range(0, n * step, step)])
+        else:
+            columns.append([None] * n if kind == "none" else [""] * n)
+
+    # dict(zip(...)) keeps the first position / last value of a repeated name,
+    # matching the per-frame record assignment.
+    by_name = dict(zip(keys, columns))
+    if not columns:
+        return [{} for _ in range(n)], by_name
+    return [dict(zip(keys, row)) for row in zip(*columns)], by_name
+
+
+# (size, big_endian, signed) per integer length/count field type, for the JIT frame scanner.
+_INT_FIELD_LAYOUT: Dict[str, Tuple[int, bool, bool]] = {
+    "uint8": (1, False, False),
+    "int8": (1, False, True),
+    "uint16_le": (2, False, False),
+    "uint16_be": (2, True, False),
+    "int16_le": (2, False, True),
+    "int16_be": (2, True, True),
+    "uint32_le": (4, False, False),
+    "uint32_be": (4, True, False),
+    "int32_le": (4, False, True),
+    "int32_be": (4, True, True),
+}
+
+
+# Below this capture size the plain bytes.find scan is fast enough to not be
+# worth a numpy header index or a Numba import/compile.
+_ACCEL_MIN_BYTES = 1 << 16
+
+
+@lru_cache(maxsize=1)
+def _frame_scan_kernel() -> Optional[Callable[..., Any]]:
+    """
+    Numba-compiled header scan + frame-length loop, or None if numpy/Numba is unavailable.
+    Imported lazily so CLI cold start does not pay for the Numba import.
+    """
+    try:
+        import numpy as np  # type: ignore
+        from numba import njit  # type: ignore
+    except Exception:
+        return None
 
-    data = frames_path.read_bytes()
-    pos = 0
-    frame_idx = 0
+    @njit(cache=True, boundscheck=False, nogil=True)
+    def scan(buf, header, fixed_len, len_off, len_span, len_size, big_endian, signed, scale, overhead):  # pragma: no cover - compiled
+        # Same walk as the Python loop: find header from pos, size the frame
+        # (fixed_len, or value * scale + overhead with the value read from the
+        # first len_size of len_span bytes at idx + len_off), keep it if it fits
+        # and advance past it, else retry one byte later.
+        #
+        # The header search is split in two: a branch-free pass records every
+        # position of the first header byte into a fixed-size hit block, then
+        # the walk visits only those hits (skipping ones inside accepted
+        # frames) and never re-searches bytes after a rejected candidate.
+        n = buf.shape[0]
+        h = header.shape[0]
+        # Byte order and sign are fixed per call, so they become a shift
+        # schedule (first shift + step per byte) and a sign-extension shift
+        # instead of per-byte/per-frame branches.
+        shift0 = np.int64(8 * (len_size - 1)) if big_endian else np.int64(0)
+        shift_step = np.int64(-8) if big_endian else np.int64(8)
+        sext = np.int64(64 - 8 * len_size) if signed else np.int64(0)
+        h0 = header[0]
+        end = n - h + 1  # last possible header start + 1
+        hits = np.empty(4096, dtype=np.int64)
+        starts = np.empty(1024, dtype=np.int64)
+        lengths = np.empty(1024, dtype=np.int64)
+        count = 0
+        pos = 0
+        scan_at = 0
+        while scan_at < end:
+            i = max(scan_at, pos)
+            m = 0
+            while i < end and m < hits.shape[0]:
+                hits[m] = i
+                m += buf[i] == h0
+                i += 1
+            scan_at = i
+            for t in range(m):
+                idx = hits[t]
+                if idx < pos:
+                    continue
+                j = 1
+                while j < h and buf[idx + j] == header[j]:
+                    j += 1
+                if j < h:
+                    continue
+                if len_size == 0:
+                    frame_len = fixed_len
+                elif n - idx < len_off + len_span:
+                    frame_len = -1
+                else:
+                    value = np.int64(0)
+                    for k in range(len_size):
+                        value |= np.int64(buf[idx + len_off + k]) << (shift0 + shift_step * k)
+                    value = (value << sext) >> sext
+                    frame_len = value * scale + overhead
+                if frame_len <= 0 or idx + frame_len > n:
+                    continue
+                if count == starts.shape[0]:
+                    starts = np.concatenate((starts, np.empty_like(starts)))
+                    lengths = np.concatenate((lengths, np.empty_like(lengths)))
+                starts[count] = idx
+                lengths[count] = frame_len
+                count += 1
+                pos = idx + frame_len
+        return starts[:count], lengths[:count]
+
+    return scan
+
+
+class _LengthRule(NamedTuple):
+    """frame.length normalized for the vectorized/JIT scanners (see _length_rule)."""
+
+    fixed_len: int  # used when len_size == 0
+    len_off: int
+    len_span: int  # declared bytes of the length/count field (bounds check)
+    len_size: int  # bytes the value is read from; 0 -> fixed length
+    big_endian: bool
+    signed: bool
+    scale: int
+    overhead: int
+
+
+def _length_rule(frame_spec: dict) -> Optional[_LengthRule]:
+    """
+    The frame length rule when it is one the scanners model exactly (fixed int
+    length, or an integer length/count field at a non-negative offset), else None.
+    """
+    length_spec = frame_spec.get("length", {})
+    mode = length_spec.get("mode", "fixed")
+    if mode == "fixed":
+        fixed_len = length_spec.get("value", 0)
+        if not isinstance(fixed_len, int):
+            return None
+        return _LengthRule(fixed_len, 0, 0, 0, False, False, 1, 0)
+    if mode in ("dynamic", "counted"):
+        field_def = length_spec.get("field" if mode == "dynamic" else "count_field", {})
+        len_off = field_def.get("offset", 0)
+        flen = field_def.get("length", 1)
+        layout = _INT_FIELD_LAYOUT.get(field_def.get("type", "uint8"))
+        overhead = length_spec.get("overhead_bytes", 0)
+        scale = length_spec.get("unit_bytes", 0) if mode == "counted" else 1
+        if layout is None or not all(isinstance(v, int) for v in (len_off, flen, overhead, scale)):
+            return None
+        len_size, big_endian, signed = layout
+        if len_off < 0 or flen < len_size:
+            return None
+        return _LengthRule(0, len_off, flen, len_size, big_endian, signed, scale, overhead)
+    return None
+
+
+def _scan_frames_jit(data: bytes, header: bytes, rule: _LengthRule) -> Optional[Tuple[List[int], List[int]]]:
+    """(frame starts, frame lengths) via the JIT scanner, or None when Numba is unavailable or fails."""
+    scan = _frame_scan_kernel()
+    if scan is None:
+        return None
+    import numpy as np  # type: ignore
+
+    try:
+        starts, lengths = scan(np.frombuffer(data, dtype=np.uint8), np.frombuffer(header, dtype=np.uint8), *rule)
+    except Exception:
+        # e.g. a stale/foreign on-disk cache (cache=True) that no longer loads:
+        # the accelerator is optional, so the caller falls back to the plain scan.
+        return None
+    return starts.tolist(), lengths.tolist()
 
+
+def _scan_frames_index(data: bytes, header: bytes, rule: _LengthRule) -> Optional[Tuple[List[int], List[int]]]:
+    """
+    (frame starts, frame lengths) without Numba: every header
+    offset is found in one vectorized pass, every candidate frame is sized at
+    once, and the sequential walk only follows precomputed "next header"
+    indices. None without numpy.
+    """
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        return None
+    u8 = np.frombuffer(data, dtype=np.uint8)
+    n = len(u8)
+
+    # Every (overlapping) header offset: one compare per header byte.
+    m = n - len(header) + 1
+    if m <= 0:
+        return [], []
+    hit = u8[:m] == header[0]
+    for j in range(1, len(header)):
+        hit &= u8[j:j + m] == header[j]
+    cand = np.flatnonzero(hit)
+    if len(cand) == 0:
+        return [], []
+
+    if rule.len_size == 0:
+        lens = np.full(len(cand), rule.fixed_len, dtype=np.int64)
+    else:
+        ok = n - cand >= rule.len_off + rule.len_span
+        base = np.where(ok, cand + rule.len_off, 0)
+        value = np.zeros(len(cand), dtype=np.int64)
+        for k in range(rule.len_size):
+            pos = base + (rule.len_size - 1 - k if rule.big_endian else k)
+            value |= u8[np.minimum(pos, n - 1)].astype(np.int64) << (8 * k)
+        if rule.signed:
+            top = 1 << (8 * rule.len_size)
+            value = np.where(value >= top >> 1, value - top, value)
+        lens = np.where(ok, value * rule.scale + rule.overhead, -1)
+
+    # A frame that fits jumps to the first header at/after its end; one that
+    # does not moves on to the next header (same as the bytes.find walk).
+    valid = (lens > 0) & (cand + lens <= n)
+    nxt = np.where(valid, np.searchsorted(cand, cand + lens), np.arange(1, len(cand) + 1)).tolist()
+    valid_l = valid.tolist()
+    picked = []
+    i = 0
+    while i < len(valid_l):
+        if valid_l[i]:
+            picked.append(i)
+        i = nxt[i]
+    return cand[picked].tolist(), lens[picked].tolist()
+
+
+def _iter_frames(data: bytes, header: bytes, frame_spec: dict) -> Iterator[Tuple[int, int]]:
+    """Yield (start, length) of each complete frame in scan order."""
+    rule = _length_rule(frame_spec) if len(data) >= _ACCEL_MIN_BYTES and header else None
+    if rule is not None:
+        spans = _scan_frames_jit(data, header, rule)
+        if spans is None and rule.len_size:
+            # Without Numba, the header index only pays off when each frame's
+            # length has to be read; a fixed-length walk is faster via bytes.find.
+            spans = _scan_frames_index(data, header, rule)
+        if spans is not None:
+            yield from zip(*spans)
+            return
+
+    pos = 0
     while pos < len(data):
         # Find header
         idx = data.find(header, pos)
         if idx < 0:
             break
 
-        # Get frame length
-        frame_len = get_frame_length(frame_spec, data[idx:])
+        # Get frame length (read in place; no data[idx:] copy)
+        frame_len = get_frame_length(frame_spec, data, idx)
         if frame_len <= 0 or idx + frame_len > len(data):
             pos = idx + 1
             continue
 
-        frame = data[idx:idx + frame_len]
-        stats.total_frames += 1
+        yield idx, frame_len
+        pos = idx + frame_len
+
+
+def decode_frames_file(
+    frames_path: Path,
+    frame_spec: dict,
+    add_frame_index: bool = True,
+    add_timestamp: bool = False,
+    jobs: int = 1,
+) -> tuple[List[Dict[str, Any]], DecodeStats]:
+    """Decode all frames from a binary file."""
+    # Map the capture read-only instead of copying it onto the heap; pages are
+    # demand-loaded as the scan walks forward. (Empty files cannot be mapped.)
+    with frames_path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return decode_frames_buffer(b"", frame_spec, add_frame_index, add_timestamp)
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return decode_frames_buffer(data, frame_spec, add_frame_index, add_timestamp, jobs=jobs)
+    finally:
+        try:
+            data.close()
+        except BufferError:
+            pass  # views still referenced by an in-flight traceback; released on GC
+
+
+# Below this many frames a process pool costs more (spawn + pickling) than it saves.
+_PARALLEL_MIN_FRAMES = 50_000
+
+
+def _decode_spans(
+    data: bytes,
+    frame_spec: dict,
+    spans: Iterable[Tuple[int, int]],
+    first_idx: int,
+    add_frame_index: bool,
+    add_timestamp: bool,
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """Decode the given (start, length) frames of data. Returns (records, decoded_ok, decode_errors)."""
+    records = []
+    decoded_ok = decode_errors = 0
+    # Frames are handed out as zero-copy views; parse_value/unpack_from accept them.
+    view = memoryview(data)
+    ops = compile_frame_spec(frame_spec)
+    frame_idx = first_idx
+    for idx, frame_len in spans:
+        frame = view[idx:idx + frame_len]
 
         record: Dict[str, Any] = {}
         if add_timestamp:
@@ -221,41 +680,327 @@ def decode_frames_file(
         if add_frame_index:
             record["_frame_idx"] = frame_idx
 
-        if decode_frame(frame, frame_spec, record):
+        if decode_frame(frame, frame_spec, record, ops):
             records.append(record)
-            stats.decoded_ok += 1
+            decoded_ok += 1
         else:
-            stats.decode_errors += 1
+            decode_errors += 1
 
         frame_idx += 1
-        pos = idx + frame_len
 
+    view.release()
+    return records, decoded_ok, decode_errors
+
+
+def _decode_spans_numpy(
+    data: bytes,
+    frame_spec: dict,
+    spans: List[Tuple[int, int]],
+    add_frame_index: bool,
+    add_timestamp: bool,
+) -> Optional[Tuple[List[Dict[str, Any]], int, int, Dict[str, List[Any]]]]:
+    """
+    Columnar equivalent of _decode_spans for variable-length frames whose
+    fields all have int offsets/lengths: each field is gathered for every frame
+    at once and viewed as its numpy type. Returns (records, decoded_ok,
+    decode_errors, columns), or None when numpy is unavailable or a field
+    length depends on another field (the caller then decodes per frame).
+    """
+    fields = frame_spec.get("fields", [])
+    for field_def in fields:
+        offset = field_def.get("offset")
+        length = field_def.get("length")
+        if not isinstance(offset, int) or not isinstance(length, int) or length < 0:
+            return None
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        return None
+
+    u8 = np.frombuffer(data, dtype=np.uint8)
+    span_arr = np.array(spans, dtype=np.int64).reshape(-1, 2)
+    starts, lens = span_arr[:, 0], span_arr[:, 1]
+
+    # A frame is dropped (counted as an error) if any field falls outside it,
+    # as in decode_frame; offsets < 0 count from the end of each frame.
+    field_offsets = []
+    ok = np.ones(len(starts), dtype=bool)
+    for field_def in fields:
+        offset, length = field_def["offset"], field_def["length"]
+        rel = lens + offset if offset < 0 else np.full(len(starts), offset, dtype=np.int64)
+        ok &= (rel >= 0) & (rel + length <= lens)
+        field_offsets.append(rel)
+    kept = np.flatnonzero(ok)
+    n = len(kept)
+    starts = starts[kept]
+
+    keys: List[str] = []
+    columns: List[Any] = []
+    if add_timestamp:
+        keys.append("_timestamp")
+        columns.append([None] * n)  # No timestamp source in offline mode
+    if add_frame_index:
+        keys.append("_frame_idx")
+        columns.append(kept.tolist())
+    for field_def, rel in zip(fields, field_offsets):
+        keys.append(field_def["name"])
+        length = field_def["length"]
+        np_type = _NP_FIELD_TYPES.get(field_def["type"])
+        width = length if np_type is None else np.dtype(np_type).itemsize
+        if np_type is not None and length < width:
+            columns.append([None] * n)
+            continue
+        if n == 0 or width == 0:
+            columns.append([""] * n if np_type is None else [])
+            continue
+        raw = u8[(starts + rel[kept])[:, None] + np.arange(width, dtype=np.int64)]
+        if np_type is not None:
+            columns.append(raw.view(np_type)[:, 0].tolist())
+        else:
+            text = raw.tobytes().hex()
+            step = 2 * width
+            columns.append([text[j : j + step] for j in range(0, n * step, step)])
+
+    by_name = dict(zip(keys, columns))
+    records = [dict(zip(keys, row)) for row in zip(*columns)] if columns else [{} for _ in range(n)]
+    return records, n, len(spans) - n, by_name
+
+
+def _decode_spans_parallel(
+    data: bytes,
+    frame_spec: dict,
+    spans: List[Tuple[int, int]],
+    jobs: int,
+    add_frame_index: bool,
+    add_timestamp: bool,
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    Split the frame list into `jobs` contiguous shards and decode them in worker
+    processes. Each worker gets only its byte range; results are merged in
+    frame order so _frame_idx and record order match the serial decode.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    step = -(-len(spans) // jobs)
+    records: List[Dict[str, Any]] = []
+    decoded_ok = decode_errors = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = []
+        for i0 in range(0, len(spans), step):
+            shard = spans[i0:i0 + step]
+            lo = shard[0][0]
+            hi = max(start + length for start, length in shard)
+            rebased = [(start - lo, length) for start, length in shard]
+            futures.append(
+                pool.submit(
+                    _decode_spans, data[lo:hi], frame_spec, rebased, i0, add_frame_index, add_timestamp
+                )
+            )
+        for fut in futures:
+            part, ok, errors = fut.result()
+            records.extend(part)
+            decoded_ok += ok
+            decode_errors += errors
+    return records, decoded_ok, decode_errors
+
+
+def decode_frames_buffer(
+    data: bytes,
+    frame_spec: dict,
+    add_frame_index: bool = True,
+    add_timestamp: bool = False,
+    jobs: int = 1,
+) -> tuple[List[Dict[str, Any]], DecodeStats]:
+    """
+    Decode all frames from an in-memory or mapped capture (bytes/mmap).
+    Large captures whose fields all have static offsets/lengths are decoded
+    column-wise with numpy; otherwise, with jobs > 1, large captures on the
+    per-frame path are decoded in a process pool.
+    """
+    stats = DecodeStats()
+
+    header = extract_header(frame_spec)
+    field_names = [f["name"] for f in frame_spec.get("fields", [])]
+    if add_frame_index:
+        field_names = ["_frame_idx"] + field_names
+    if add_timestamp:
+        field_names = ["_timestamp"] + field_names
+    stats.field_names = field_names
+
+    fast = _decode_fixed_numpy(data, header, frame_spec, add_frame_index, add_timestamp)
+    if fast is not None:
+        records, stats.columns = fast
+        stats.total_frames = stats.decoded_ok = len(records)
+        return records, stats
+
+    spans: Iterable[Tuple[int, int]] = _iter_frames(data, header, frame_spec)
+    if len(data) >= _ACCEL_MIN_BYTES:
+        spans = list(spans)
+        columnar = _decode_spans_numpy(data, frame_spec, spans, add_frame_index, add_timestamp)
+        if columnar is not None:
+            records, stats.decoded_ok, stats.decode_errors, stats.columns = columnar
+            stats.total_frames = stats.decoded_ok + stats.decode_errors
+            return records, stats
+    if jobs > 1:
+        spans = list(spans)
+        if len(spans) >= _PARALLEL_MIN_FRAMES:
+            records, stats.decoded_ok, stats.decode_errors = _decode_spans_parallel(
+                data, frame_spec, spans, jobs, add_frame_index, add_timestamp
+            )
+            stats.total_frames = stats.decoded_ok + stats.decode_errors
+            return records, stats
+
+    records, stats.decoded_ok, stats.decode_errors = _decode_spans(
+        data, frame_spec, spans, 0, add_frame_index, add_timestamp
+    )
+    stats.total_frames = stats.decoded_ok + stats.decode_errors
     return records, stats
 
 
-def write_csv(records: List[Dict[str, Any]], output_path: Path, field_names: List[str]) -> None:
+def _write_csv_columns(columns: Dict[str, List[Any]], output_path: Path, field_names: List[str]) -> bool:
+    """
+    Columnar CSV writer (pyarrow). Produces the same bytes as the csv.writer
+    path, or returns False without writing when it cannot: pyarrow missing, a
+    column type it would format differently, or a value that would need quoting.
+    """
+    if len(field_names) < 2:  # csv.writer quotes a lone empty field as ""
+        return False
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.compute as pc  # type: ignore
+        import pyarrow.csv as pa_csv  # type: ignore
+    except ImportError:
+        return False
+
+    n = len(next(iter(columns.values()), []))
+    arrays = []
+    for name in field_names:
+        col = columns.get(name)
+        if col is None:
+            arrays.append(pa.nulls(n))
+            continue
+        try:
+            arr = pa.array(col)
+        except (pa.ArrowException, TypeError, ValueError):
+            return False
+        if pa.types.is_floating(arr.type):
+            # Arrow's float formatting differs from repr(); keep Python's text.
+            text = map(repr, col) if arr.null_count == 0 else (None if v is None else repr(v) for v in col)
+            arr = pa.array(list(text), type=pa.string())
+        elif pa.types.is_string(arr.type):
+            if pc.any(pc.match_substring_regex(arr, '[,"\r\n]')).as_py():
+                return False
+        elif not (pa.types.is_integer(arr.type) or pa.types.is_null(arr.type)):
+            return False
+        arrays.append(arr)
+
     with output_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=field_names, extrasaction="ignore")
-        writer.writeheader()
-        for r in records:
-            row: Dict[str, Any] = {}
-            for k in field_names:
-                v = r.get(k)
-                if isinstance(v, (dict, list)):
-                    row[k] = json.dumps(v, ensure_ascii=False)
-                else:
-                    row[k] = v
-            writer.writerow(row)
+        csv.writer(f).writerow(field_names)
+    with output_path.open("ab", buffering=1 << 20) as f:
+        pa_csv.write_csv(
+            pa.Table.from_arrays(arrays, names=[f"c{i}" for i in range(len(arrays))]),
+            f,
+            pa_csv.WriteOptions(include_header=False, quoting_style="none", eol="\r\n"),
+        )
+    return True
 
 
-def write_json(records: List[Dict[str, Any]], output_path: Path) -> None:
-    output_path.write_text(
-        json.dumps(records, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+def write_csv(
+    records: List[Dict[str, Any]],
+    output_path: Path,
+    field_names: List[str],
+    columns: Optional[Dict[str, List[Any]]] = None,
+) -> None:
+    if columns is not None and records and _write_csv_columns(columns, output_path, field_names):
+        return
+    # Positional writer: one list per row, no intermediate dict or DictWriter
+    # re-lookup. Missing keys and None both write as "", as DictWriter did.
+    dumps = json.dumps
+    with output_path.open("w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(field_names)
+        writer.writerows(
+            [dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v for v in map(r.get, field_names)]
+            for r in records
+        )
+
+
+_INF = float("inf")
+
+
+def _has_nonfinite(obj: Any) -> bool:
+    if isinstance(obj, float):
+        return obj != obj or obj in (_INF, -_INF)
+    if isinstance(obj, dict):
+        return any(map(_has_nonfinite, obj.values()))
+    if isinstance(obj, (list, tuple)):
+        return any(map(_has_nonfinite, obj))
+    return False
+
+
+def _record_encoder() -> Callable[[Any], bytes]:
+    """
+    Compact per-record JSON encoder (UTF-8 bytes): orjson when installed, else stdlib json.
+    orjson writes NaN/Infinity as null, so records holding one go through stdlib json
+    (NaN/Infinity, as without orjson); only output containing `null` needs the check.
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    try:
+        import orjson  # type: ignore
+    except Exception:
+        return lambda obj: encode(obj).encode("utf-8")
+
+    dumps = orjson.dumps
+
+    def encode_record(obj: Any) -> bytes:
+        out = dumps(obj)
+        if b"null" in out and _has_nonfinite(obj):
+            return encode(obj).encode("utf-8")
+        return out
+
+    return encode_record
 
 
-def write_parquet(records: List[Dict[str, Any]], output_path: Path) -> None:
+def write_json(records: List[Dict[str, Any]], output_path: Path, pretty: bool = False) -> None:
+    # Streamed one record per line inside the array, so the whole document is
+    # never built in memory; --pretty keeps the old indent=2 single dump.
+    if pretty:
+        output_path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+        return
+    encode = _record_encoder()
+    with output_path.open("wb", buffering=1 << 20) as f:
+        f.write(b"[")
+        sep = b"\n"
+        for r in records:
+            f.write(sep)
+            f.write(encode(r))
+            sep = b",\n"
+        f.write(b"\n]\n")
+
+
+def write_jsonl(records: List[Dict[str, Any]], output_path: Path) -> None:
+    encode = _record_encoder()
+    with output_path.open("wb", buffering=1 << 20) as f:
+        for r in records:
+            f.write(encode(r))
+            f.write(b"\n")
+
+
+def write_parquet(
+    records: List[Dict[str, Any]], output_path: Path, columns: Optional[Dict[str, List[Any]]] = None
+) -> None:
+    """
+    Write records as Parquet. When the same data is available column-wise
+    (`columns`), the table is built by pyarrow directly, without a DataFrame.
+    """
+    if columns is not None and records:  # empty output keeps the DataFrame's column-less schema
+        try:
+            import pyarrow as pa  # type: ignore
+            import pyarrow.parquet as pq  # type: ignore
+        except ImportError:
+            raise SystemExit("pyarrow not installed. Install with: pip install pyarrow")
+        pq.write_table(pa.Table.from_pydict(columns), str(output_path))
+        return
     try:
         import pandas as pd
         df = pd.DataFrame(records)
@@ -264,6 +1009,42 @@ def write_parquet(records: List[Dict[str, Any]], output_path: Path) -> None:
         raise SystemExit("pandas/pyarrow not installed. Install with: pip install pandas pyarrow")
 
 
+_IF_FRAME_KEYS = {
+    # (has_speed, has_bright, bright_u16) -> frame_selector.frames key
+    (False, False, False): "no_speed_dist_only",
+    (False, False, True): "no_speed_dist_only",
+    (True, False, False): "speed_dist_only",
+    (True, False, True): "speed_dist_only",
+    (False, True, False): "no_speed_dist_brightness_u8",
+    (True, True, False): "speed_dist_brightness_u8",
+    (False, True, True): "no_speed_dist_brightness_u16",
+    (True, True, True): "speed_dist_brightness_u16",
+}
+
+
+def _if_frame_table(selector: dict) -> List[Optional[str]]:
+    """
+    Frame name for each of the 256 IF byte values under an if_bits_v1 selector
+    (None where selector.frames has no name for the bit combination).
+    """
+    b_bright = int(selector.get("brightness_bit", 0))
+    b_speed = int(selector.get("speed_bit", 1))
+    b_blen = int(selector.get("brightness_len_bit", 2))
+    inv_bright = bool(selector.get("invert_brightness_bit", False))
+    inv_speed = bool(selector.get("invert_speed_bit", False))
+    inv_blen = bool(selector.get("invert_brightness_len_bit", False))
+    frames_map = selector.get("frames", {}) if isinstance(selector.get("frames", {}), dict) else {}
+
+    table: List[Optional[str]] = []
+    for if_byte in range(256):
+        has_bright = bool((if_byte >> b_bright) & 1) ^ inv_bright
+        has_speed = bool((if_byte >> b_speed) & 1) ^ inv_speed
+        bright_u16 = bool((if_byte >> b_blen) & 1) ^ inv_blen
+        name = frames_map.get(_IF_FRAME_KEYS[(has_speed, has_bright, bright_u16)])
+        table.append(name if isinstance(name, str) else None)
+    return table
+
+
 def cmd_decode(args: argparse.Namespace) -> None:
     dvk_root = find_dvk_root(Path(__file__).parent)
     device_id = args.device_id
@@ -311,36 +1092,13 @@ def cmd_decode(args: argparse.Namespace) -> None:
     if frame_spec is None and args.auto_frame_by_if:
         selector = protocol.get("frame_selector")
         if isinstance(selector, dict) and selector.get("type") == "if_bits_v1":
-            sample = frames_path.read_bytes()[:65535]
+            with frames_path.open("rb") as f:
+                sample = f.read(65535)
             # Expect IF at offset selector.if_offset relative to frame start.
             if_offset = int(selector.get("if_offset", 2))
             if len(sample) > if_offset:
-                if_byte = sample[if_offset]
-                b_bright = int(selector.get("brightness_bit", 0))
-                b_speed = int(selector.get("speed_bit", 1))
-                b_blen = int(selector.get("brightness_len_bit", 2))
-                inv_bright = bool(selector.get("invert_brightness_bit", False))
-                inv_speed = bool(selector.get("invert_speed_bit", False))
-                inv_blen = bool(selector.get("invert_brightness_len_bit", False))
-                has_bright = bool((if_byte >> b_bright) & 1) ^ inv_bright
-                has_speed = bool((if_byte >> b_speed) & 1) ^ inv_speed
-                bright_u16 = bool((if_byte >> b_blen) & 1) ^ inv_blen
-                frames_map = selector.get("frames", {}) if isinstance(selector.get("frames", {}), dict) else {}
-                key = None
-                if not has_speed and not has_bright:
-                    key = "no_speed_dist_only"
-                elif has_speed and not has_bright:
-                    key = "speed_dist_only"
-                elif (not has_speed) and has_bright and (not bright_u16):
-                    key = "no_speed_dist_brightness_u8"
-                elif has_speed and has_bright and (not bright_u16):
-                    key = "speed_dist_brightness_u8"
-                elif (not has_speed) and has_bright and bright_u16:
-                    key = "no_speed_dist_brightness_u16"
-                elif has_speed and has_bright and bright_u16:
-                    key = "speed_dist_brightness_u16"
-                if key and isinstance(frames_map.get(key), str):
-                    frame_name = frames_map[key]
+                frame_name = _if_frame_table(selector)[sample[if_offset]]
+                if frame_name is not None:
                     frame_spec = next((f for f in frames if f.get("name") == frame_name), None)
 
     if frame_spec is None:
@@ -351,15 +1109,19 @@ def cmd_decode(args: argparse.Namespace) -> None:
         frames_path,
         frame_spec,
         add_frame_index=not args.no_index,
-        add_timestamp=args.add_timestamp
+        add_timestamp=args.add_timestamp,
+        jobs=args.jobs or (os.cpu_count() or 1),
     )
 
     # Attach frame name for semantic transforms
     for r in records:
         r.setdefault("_frame_name", frame_spec.get("name"))
+    if stats.columns is not None:
+        stats.columns.setdefault("_frame_name", [frame_spec.get("name")] * len(records))
 
     # Semantic decode (optional; driven by commands.yaml telemetry section)
     semantic_records: List[Dict[str, Any]] = records
+    semantic_field_names: Optional[List[str]] = None
     semantic_applied = False
     semantic_reason = "semantic disabled"
     commands_path: Optional[Path] = None
@@ -378,6 +1140,7 @@ def cmd_decode(args: argparse.Namespace) -> None:
 
                 res = apply_semantics(records, commands=cmd_doc)
                 semantic_records = res.records
+                semantic_field_names = res.field_names
                 semantic_applied = res.applied
                 semantic_reason = res.reason
             except Exception as e:
@@ -393,21 +1156,28 @@ def cmd_decode(args: argparse.Namespace) -> None:
     # Write output based on format
     fmt = args.format.lower()
     def ext() -> str:
-        return "csv" if fmt == "csv" else ("json" if fmt == "json" else "parquet")
+        return fmt if fmt in ("csv", "json", "jsonl") else "parquet"
 
     raw_out_path = out_dir / f"decoded_raw.{ext()}"
     semantic_out_path = out_dir / f"decoded.{ext()}"
 
     if fmt == "csv":
         # field names for semantic may differ from raw
-        write_csv(records, raw_out_path, stats.field_names)
-        semantic_fields = sorted({k for r in semantic_records for k in r.keys()})
+        write_csv(records, raw_out_path, stats.field_names, columns=stats.columns)
+        # Transforms report their (uniform) keys; otherwise union the keys in C via set.union.
+        if semantic_field_names is not None:
+            semantic_fields = sorted(semantic_field_names)
+        else:
+            semantic_fields = sorted(set().union(*semantic_records))
         write_csv(semantic_records, semantic_out_path, semantic_fields)
     elif fmt == "json":
-        write_json(records, raw_out_path)
-        write_json(semantic_records, semantic_out_path)
+        write_json(records, raw_out_path, pretty=args.pretty)
+        write_json(semantic_records, semantic_out_path, pretty=args.pretty)
+    elif fmt == "jsonl":
+        write_jsonl(records, raw_out_path)
+        write_jsonl(semantic_records, semantic_out_path)
     elif fmt == "parquet":
-        write_parquet(records, raw_out_path)
+        write_parquet(records, raw_out_path, columns=stats.columns)
         write_parquet(semantic_records, semantic_out_path)
     else:
         raise SystemExit(f"Unsupported format: {fmt}")
@@ -454,9 +1224,16 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--commands", help="Path to commands.yaml (optional; enables semantic decode via telemetry section)")
     p.add_argument("--frame-name", help="Frame name to decode (default: first frame)")
     p.add_argument("--auto-frame-by-if", action="store_true", help="Auto-select frame by IF bits (requires protocol.frame_selector)")
-    p.add_argument("--format", choices=["csv", "json", "parquet"], default="csv", help="Output format")
+    p.add_argument("--format", choices=["csv", "json", "jsonl", "parquet"], default="csv", help="Output format")
+    p.add_argument("--pretty", action="store_true", help="Indent JSON output (default: compact, one record per line)")
     p.add_argument("--no-index", action="store_true", help="Do not add _frame_idx column")
     p.add_argument("--add-timestamp", action="store_true", help="Add _timestamp column (offline: null)")
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for large variable-length captures (0 = all CPUs; default: 1)",
+    )
     return p
 
 
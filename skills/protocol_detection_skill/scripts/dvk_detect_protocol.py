@@ -15,15 +15,22 @@ This repo does NOT bundle Python packages. Install dependencies yourself:
 from __future__ import annotations
 
 import argparse
+import codecs
+import mmap
 import os
 import re
+import shutil
+import struct
 import sys
+import tempfile
 import time
 import json
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 
 
 def _require_yaml() -> Any:
@@ -38,6 +45,13 @@ def _require_yaml() -> Any:
     return yaml
 
 
+@lru_cache(maxsize=1)
+def _yaml_codec() -> Tuple[Any, Any, Any]:
+    """(yaml, Loader, Dumper): the libyaml-backed safe loader/dumper when PyYAML was built with it."""
+    yaml = _require_yaml()
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader), getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
 def _require_serial() -> Any:
     try:
         import serial  # type: ignore
@@ -52,10 +66,14 @@ def _require_serial() -> Any:
 
 def find_dvk_root(start: Path) -> Path:
     """Find DVK root by locating .claude-plugin/plugin.json marker file."""
-    current = start.resolve()
-    for parent in [current, *current.parents]:
-        if (parent / ".claude-plugin" / "plugin.json").exists():
-            return parent
+    current = str(start.resolve())
+    while True:
+        if os.path.isfile(os.path.join(current, ".claude-plugin", "plugin.json")):
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
     raise SystemExit("Cannot locate DVK root (missing .claude-plugin/plugin.json)")
 
 
@@ -69,19 +87,35 @@ from dvk.checksums import verify_checksum  # noqa: E402
 
 
 def load_yaml(path: Path) -> dict:
-    yaml = _require_yaml()
+    yaml, loader, _ = _yaml_codec()
     if not path.exists():
         raise SystemExit(f"YAML not found: {path}")
-    return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    return yaml.load(path.read_text(encoding="utf-8"), Loader=loader) or {}
 
 
 def dump_yaml(path: Path, obj: dict) -> None:
-    yaml = _require_yaml()
+    yaml, _, dumper = _yaml_codec()
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(yaml.safe_dump(obj, sort_keys=False, allow_unicode=True), encoding="utf-8")
+    path.write_text(yaml.dump(obj, Dumper=dumper, sort_keys=False, allow_unicode=True), encoding="utf-8")
+
+
+def _fromhex_tokens(tokens: List[Any]) -> Optional[bytes]:
+    """
+    "0xNN" tokens as bytes in one bytes.fromhex call, or None when any token is
+    not of that form (callers then walk the tokens to report the bad one).
+    """
+    try:
+        out = bytes.fromhex("".join([t[2:] for t in tokens if len(t) == 4 and t[:2] in ("0x", "0X")]))
+    except (TypeError, ValueError):
+        return None
+    # Dropped or whitespace-padded tokens leave fewer bytes than tokens.
+    return out if len(out) == len(tokens) else None
 
 
 def parse_hex_bytes(tokens: List[str]) -> bytes:
+    fast = _fromhex_tokens(tokens)
+    if fast is not None:
+        return fast
     out = bytearray()
     for t in tokens:
         if not isinstance(t, str) or not t.lower().startswith("0x") or len(t) != 4:
@@ -100,45 +134,154 @@ class DetectionResult:
     method: str
 
 
+class SniffScore(NamedTuple):
+    """One scored pick_by_sniff candidate."""
+
+    protocol_id: str
+    protocol_version: str
+    protocol_json: str
+    frames_ok: int
+    frames_bad_checksum: int
+    resyncs: int
+    score: int
+
+    def as_dict(self) -> dict:
+        """Run-record form (only the rows actually written are converted)."""
+        return self._asdict()
+
+
+@lru_cache(maxsize=256)
+def _load_protocol_json_cached(path: str, mtime_ns: int) -> dict:
+    # Keyed on mtime so an edited protocol.json is re-read; callers treat the dict as read-only.
+    with open(path, "rb") as f:
+        return json.loads(f.read())
+
+
 def load_protocol_json(path: Path) -> dict:
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return _load_protocol_json_cached(str(path), os.stat(path).st_mtime_ns)
     except FileNotFoundError:
         raise SystemExit(f"protocol.json not found: {path}")
     except json.JSONDecodeError as e:
         raise SystemExit(f"Invalid JSON in {path}: {e}")
 
 
-def list_protocol_candidates(dvk_root: Path) -> List[Tuple[str, str, Path]]:
+_PROTOCOL_INDEX_NAME = ".index.json"
+
+
+def _read_protocol_index(index_path: Path) -> Dict[str, dict]:
+    """{relative path: entry} from spec/protocols/.index.json; empty if missing or unreadable."""
+    try:
+        with open(index_path, "rb") as f:
+            doc = json.loads(f.read())
+        return {str(e["path"]): e for e in doc.get("entries", []) if isinstance(e, dict) and "path" in e}
+    except (OSError, ValueError, TypeError, AttributeError, KeyError):
+        return {}
+
+
+def _write_protocol_index(index_path: Path, entries: List[dict]) -> None:
+    # Best effort: a read-only checkout just keeps parsing on every run.
+    # The temp file is removed on any failure, including an interrupted write.
+    tmp_name = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=index_path.parent, prefix=".index.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp_name = tmp.name
+            json.dump({"version": 1, "entries": entries}, tmp, indent=1)
+        os.replace(tmp_name, index_path)
+        tmp_name = None
+    except OSError:
+        pass
+    finally:
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+def list_protocol_candidates(
+    dvk_root: Path, allowed_ids: Optional[Set[str]] = None
+) -> List[Tuple[str, str, Path]]:
     """
     Return [(protocol_id, protocol_version, protocol_json_path)].
     Layout:
     - spec/protocols/<protocol_id>/protocol.json
     (protocol_version is stored inside protocol.json)
+
+    IDs/versions are cached in spec/protocols/.index.json keyed on each file's
+    mtime and size, so unchanged protocol.json files are stat'ed, not parsed.
+
+    With `allowed_ids` (a model's protocol bundles) only candidates declaring
+    one of those IDs are returned. The whole tree is still walked: any
+    directory may hold a protocol.json that declares a given protocol_id.
     """
     base = dvk_root / "spec" / "protocols"
+    index_path = base / _PROTOCOL_INDEX_NAME
+    index = _read_protocol_index(index_path)
     paths = list(base.rglob("protocol.json"))
+    out, entries, changed = _index_protocol_paths(base, paths, index)
+    if changed or len(index) != len(paths):
+        if base.is_dir():
+            _write_protocol_index(index_path, entries)
+    if allowed_ids:
+        out = [c for c in out if c[0] in allowed_ids]
+    return out
+
+
+def _index_protocol_paths(
+    base: Path, paths: List[Path], index: Dict[str, dict]
+) -> Tuple[List[Tuple[str, str, Path]], List[dict], bool]:
+    """Candidates for `paths` plus their index entries; `changed` if any entry was (re)built."""
+    entries: List[dict] = []
+    changed = False
     out: List[Tuple[str, str, Path]] = []
     for p in paths:
         rel = p.relative_to(base)
-        parts = rel.parts
-        protocol_id = parts[0] if parts else "unknown"
-        protocol_version = "unknown"
+        key = rel.as_posix()
         try:
-            doc = load_protocol_json(p)
-            protocol_id = str(doc.get("protocol_id") or protocol_id)
-            protocol_version = str(doc.get("protocol_version") or protocol_version)
-        except SystemExit:
+            st = p.stat()
+        except OSError:
+            changed = True
             continue
-        out.append((protocol_id, protocol_version, p))
-    return out
+        entry = index.get(key)
+        if entry is None or entry.get("mtime_ns") != st.st_mtime_ns or entry.get("size") != st.st_size:
+            changed = True
+            parts = rel.parts
+            protocol_id: Optional[str] = parts[0] if parts else "unknown"
+            protocol_version = "unknown"
+            try:
+                doc = load_protocol_json(p)
+                protocol_id = str(doc.get("protocol_id") or protocol_id)
+                protocol_version = str(doc.get("protocol_version") or protocol_version)
+            except SystemExit:
+                protocol_id = None  # invalid protocol.json; remembered so it is not re-parsed
+            entry = {
+                "path": key,
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "protocol_id": protocol_id,
+                "protocol_version": protocol_version,
+            }
+        entries.append(entry)
+        if entry.get("protocol_id") is not None:
+            out.append((str(entry["protocol_id"]), str(entry["protocol_version"]), p))
+    return out, entries, changed
+
+
+@lru_cache(maxsize=64)
+def _load_model_doc_cached(path: str, mtime_ns: int) -> dict:
+    return load_yaml(Path(path))
 
 
 def load_model_doc(dvk_root: Path, model_id: str) -> dict:
     path = dvk_root / "spec" / "models" / f"{model_id}.yaml"
-    if not path.exists():
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
         return {}
-    return load_yaml(path)
+    return _load_model_doc_cached(str(path), mtime_ns)
 
 
 def protocol_refs_for_model(model_doc: dict) -> List[Tuple[str, Optional[str]]]:
@@ -179,6 +322,9 @@ def extract_header(frame_spec: dict) -> bytes:
     header = frame_spec.get("header")
     if not isinstance(header, list) or not header:
         raise ValueError("frame.header must be a non-empty list")
+    fast = _fromhex_tokens(header)
+    if fast is not None:
+        return fast
     out = bytearray()
     for token in header:
         t = str(token)
@@ -198,56 +344,226 @@ def parse_length_spec(frame_spec: dict) -> dict:
     raise ValueError("frame.length must be an object")
 
 
-def iter_frames(sample: bytes, frame_spec: dict, enable_checksum: bool) -> Tuple[int, int, int]:
-    """
-    Returns (frames_ok, frames_bad_checksum, resyncs) for this frame_spec.
-    """
+_UINT_BYTEORDER = {"uint16_le": "little", "uint16_be": "big", "uint32_le": "little", "uint32_be": "big"}
+_UINT_STRUCTS = {
+    "uint16_le": struct.Struct("<H"),
+    "uint16_be": struct.Struct(">H"),
+    "uint32_le": struct.Struct("<I"),
+    "uint32_be": struct.Struct(">I"),
+}
+
+
+@dataclass(frozen=True)
+class CompiledFrameSpec:
+    """A frame spec as iter_frames needs it: header bytes and length rule resolved once."""
+
+    header: bytes
+    mode: str  # "fixed" | "dynamic" | "counted"; anything else never sizes a frame
+    fixed_len: int = -1
+    len_off: int = -1
+    len_ln: int = -1
+    len_type: str = ""
+    unit_bytes: int = 1  # counted: bytes per unit; dynamic: 1
+    overhead: int = 0
+    checksum: Optional[dict] = None
+    # Reads a multi-byte length/count value in place when the field is exactly
+    # the struct's width (parse_uint reads all len_ln bytes otherwise).
+    len_unpack: Optional[Callable[..., Tuple[int]]] = None
+
+
+def compile_frame_spec(frame_spec: dict) -> CompiledFrameSpec:
     header = extract_header(frame_spec)
     length = parse_length_spec(frame_spec)
-    checksum_spec = frame_spec.get("checksum") if enable_checksum else None
+    checksum = frame_spec.get("checksum")
+    checksum = checksum if isinstance(checksum, dict) and checksum else None
+    mode = length.get("mode")
+    if mode == "fixed":
+        return CompiledFrameSpec(header, "fixed", fixed_len=int(length.get("value", -1)), checksum=checksum)
+    if mode in ("dynamic", "counted"):
+        field = length.get("field" if mode == "dynamic" else "count_field", {})
+        len_ln = int(field.get("length", -1))
+        len_type = str(field.get("type", ""))
+        st = _UINT_STRUCTS.get(len_type)
+        return CompiledFrameSpec(
+            header,
+            mode,
+            len_off=int(field.get("offset", -1)),
+            len_ln=len_ln,
+            len_type=len_type,
+            unit_bytes=1 if mode == "dynamic" else int(length.get("unit_bytes", 0)),
+            overhead=int(length.get("overhead_bytes", 0)),
+            checksum=checksum,
+            len_unpack=st.unpack_from if st is not None and st.size == len_ln else None,
+        )
+    return CompiledFrameSpec(header, str(mode), checksum=checksum)
+
+
+# Below this sample size the Python walk is fast enough to not be worth a Numba import/compile.
+_SNIFF_ACCEL_MIN_BYTES = 1 << 16
 
-    buf = bytearray(sample)
+
+@lru_cache(maxsize=1)
+def _sniff_scan_kernel() -> Optional[Callable[..., Any]]:
+    """
+    Numba-compiled iter_frames walk (header search + frame length), or None if
+    numpy/Numba is unavailable. Imported lazily so CLI cold start does not pay for it.
+    """
+    try:
+        import numpy as np  # type: ignore
+        from numba import njit  # type: ignore
+    except Exception:
+        return None
+
+    @njit(cache=True, boundscheck=False, nogil=True)
+    def scan(buf, header, fixed_len, len_off, len_span, len_size, big_endian, scale, overhead):  # pragma: no cover - compiled
+        # Same walk as iter_frames: find the header from pos (a skip counts as
+        # a resync), size the frame (fixed_len, or value * scale + overhead with
+        # the value read from the first len_size of len_span bytes at
+        # pos + len_off), and stop at the first frame that is unsized or incomplete.
+        n = buf.shape[0]
+        h = header.shape[0]
+        starts = np.empty(256, dtype=np.int64)
+        lengths = np.empty(256, dtype=np.int64)
+        count = 0
+        resyncs = 0
+        pos = 0
+        while True:
+            idx = -1
+            i = pos
+            while i + h <= n:
+                j = 0
+                while j < h and buf[i + j] == header[j]:
+                    j += 1
+                if j == h:
+                    idx = i
+                    break
+                i += 1
+            if idx < 0:
+                break
+            if idx > pos:
+                resyncs += 1
+                pos = idx
+            if len_size == 0:
+                total_len = fixed_len
+            elif n - pos < len_off + len_span:
+                break
+            else:
+                value = np.int64(0)
+                for k in range(len_size):
+                    b = np.int64(buf[pos + len_off + (len_size - 1 - k if big_endian else k)])
+                    value |= b << np.int64(8 * k)
+                total_len = value * scale + overhead
+            if total_len <= 0 or n - pos < total_len:
+                break
+            if count == starts.shape[0]:
+                starts = np.concatenate((starts, np.empty_like(starts)))
+                lengths = np.concatenate((lengths, np.empty_like(lengths)))
+            starts[count] = pos
+            lengths[count] = total_len
+            count += 1
+            pos += total_len
+        return starts[:count], lengths[:count], resyncs
+
+    return scan
+
+
+def _sniff_length_rule(spec: CompiledFrameSpec) -> Optional[Tuple[int, int, int, int, bool, int, int]]:
+    """
+    The spec's length rule as scan-kernel arguments (fixed_len, len_off,
+    len_span, len_size, big_endian, scale, overhead), or None when the kernel
+    cannot express it (unknown mode/type or a field wider than 7 bytes).
+    """
+    if spec.mode == "fixed":
+        return spec.fixed_len, 0, 0, 0, False, 0, 0
+    if spec.mode not in ("dynamic", "counted"):
+        return None
+    if spec.len_off < 0 or spec.len_ln <= 0:
+        return -1, 0, 0, 0, False, 0, 0  # never sized: the walk stops at the first header
+    if spec.len_ln > 7 or (spec.len_type != "uint8" and spec.len_type not in _UINT_BYTEORDER):
+        return None
+    # parse_uint: uint8 reads the first byte; the other types read all len_ln bytes.
+    len_size = 1 if spec.len_type == "uint8" else spec.len_ln
+    big_endian = spec.len_type.endswith("_be")
+    return -1, spec.len_off, spec.len_ln, len_size, big_endian, spec.unit_bytes, spec.overhead
+
+
+def iter_frames(sample: bytes, frame_spec: Any, enable_checksum: bool) -> Tuple[int, int, int]:
+    """
+    Returns (frames_ok, frames_bad_checksum, resyncs) for this frame_spec
+    (a protocol.json frame dict or a CompiledFrameSpec). `sample` is bytes or
+    a read-only mmap.
+    """
+    spec = frame_spec if isinstance(frame_spec, CompiledFrameSpec) else compile_frame_spec(frame_spec)
+    header = spec.header
+    checksum_spec = spec.checksum if enable_checksum else None
+
+    rule = _sniff_length_rule(spec) if len(sample) >= _SNIFF_ACCEL_MIN_BYTES else None
+    scan = _sniff_scan_kernel() if rule is not None else None
+    if scan is not None:
+        import numpy as np  # type: ignore
+
+        try:
+            starts, lengths, resyncs = scan(
+                np.frombuffer(sample, dtype=np.uint8), np.frombuffer(header, dtype=np.uint8), *rule
+            )
+        except Exception:
+            scan = None  # optional accelerator (e.g. an unloadable cache=True entry): use the cursor walk
+    if scan is not None:
+        if checksum_spec is None:
+            return len(starts), 0, int(resyncs)
+        ok = bad = 0
+        view = memoryview(sample)
+        for start, total_len in zip(starts.tolist(), lengths.tolist()):
+            try:
+                good = verify_checksum(view[start : start + total_len], checksum_spec)
+            except Exception:
+                good = False
+            if good:
+                ok += 1
+            else:
+                bad += 1
+        view.release()
+        return ok, bad, int(resyncs)
+
+    # Cursor walk over the immutable sample: no bytearray copy or front trimming.
+    n = len(sample)
+    sized = spec.mode in ("dynamic", "counted") and spec.len_off >= 0 and spec.len_ln > 0
+    fixed_len = spec.fixed_len if spec.mode == "fixed" else -1
+    off, ln, tp = spec.len_off, spec.len_ln, spec.len_type
+    byteorder = _UINT_BYTEORDER.get(tp)
+    unpack = spec.len_unpack
+    unit_bytes, overhead = spec.unit_bytes, spec.overhead
+    pos = 0
     ok = 0
     bad = 0
     resyncs = 0
 
     while True:
-        idx = buf.find(header)
+        idx = sample.find(header, pos)
         if idx < 0:
             break
-        if idx > 0:
+        if idx > pos:
             resyncs += 1
-            del buf[:idx]
-
-        total_len = -1
-        if length.get("mode") == "fixed":
-            total_len = int(length.get("value", -1))
-        elif length.get("mode") == "dynamic":
-            field = length.get("field", {})
-            off = int(field.get("offset", -1))
-            ln = int(field.get("length", -1))
-            tp = str(field.get("type", ""))
-            overhead = int(length.get("overhead_bytes", 0))
-            if off >= 0 and ln > 0 and len(buf) >= off + ln:
-                payload_len = parse_uint(bytes(buf[off : off + ln]), tp)
-                total_len = payload_len + overhead
-        elif length.get("mode") == "counted":
-            field = length.get("count_field", {})
-            off = int(field.get("offset", -1))
-            ln = int(field.get("length", -1))
-            tp = str(field.get("type", ""))
-            overhead = int(length.get("overhead_bytes", 0))
-            unit_bytes = int(length.get("unit_bytes", 0))
-            if off >= 0 and ln > 0 and len(buf) >= off + ln:
-                count = parse_uint(bytes(buf[off : off + ln]), tp)
-                total_len = (count * unit_bytes) + overhead
-        if total_len <= 0 or len(buf) < total_len:
+            pos = idx
+
+        total_len = fixed_len
+        if sized and n - pos >= off + ln:
+            if tp == "uint8":
+                value = sample[pos + off]
+            elif unpack is not None:
+                value = unpack(sample, pos + off)[0]
+            elif byteorder is not None:
+                value = int.from_bytes(sample[pos + off : pos + off + ln], byteorder)
+            else:
+                value = parse_uint(b"", tp)  # raises for the unsupported type
+            total_len = value * unit_bytes + overhead
+        if total_len <= 0 or n - pos < total_len:
             break
 
-        frame = bytes(buf[:total_len])
-        del buf[:total_len]
+        frame = sample[pos : pos + total_len]
+        pos += total_len
 
-        if checksum_spec and isinstance(checksum_spec, dict):
+        if checksum_spec is not None:
             try:
                 if not verify_checksum(frame, checksum_spec):
                     bad += 1
@@ -261,12 +577,18 @@ def iter_frames(sample: bytes, frame_spec: dict, enable_checksum: bool) -> Tuple
     return ok, bad, resyncs
 
 
+@lru_cache(maxsize=128)
+def _rule_regex(pattern: str) -> "re.Pattern[str]":
+    """Compiled (MULTILINE) rule pattern; rules are matched many times per run."""
+    return re.compile(pattern, re.MULTILINE)
+
+
 def match_banner(rule: dict, banner_text: str) -> Tuple[Optional[DetectionResult], Dict[str, str]]:
     match_cfg = rule.get("match", {})
     regex = match_cfg.get("regex")
     if not regex:
         return None, {}
-    m = re.search(regex, banner_text, flags=re.MULTILINE)
+    m = _rule_regex(str(regex)).search(banner_text)
     if not m:
         return None, {}
 
@@ -289,7 +611,21 @@ def match_banner(rule: dict, banner_text: str) -> Tuple[Optional[DetectionResult
     )
 
 
-def sniff_score_protocol(protocol_json_path: Path, sample: bytes) -> Tuple[int, int, int]:
+def _frame_sniff_key(frame_spec: dict) -> str:
+    # The frame keys iter_frames depends on (name/fields do not affect the sniff score).
+    return json.dumps(
+        [frame_spec.get(k) for k in ("header", "length", "total_length", "checksum")], sort_keys=True, default=str
+    )
+
+
+def sniff_score_protocol(
+    protocol_json_path: Path, sample: bytes, memo: Optional[Dict[str, Tuple[int, int, int]]] = None
+) -> Tuple[int, int, int]:
+    """
+    Sum of iter_frames over the protocol's frames. `memo` (per sample) shares
+    results between candidates that declare the same frame, e.g. two versions
+    of one protocol.
+    """
     doc = load_protocol_json(protocol_json_path)
     frames = doc.get("frames", [])
     if not isinstance(frames, list) or not frames:
@@ -301,7 +637,14 @@ def sniff_score_protocol(protocol_json_path: Path, sample: bytes) -> Tuple[int,
     for f in frames:
         if not isinstance(f, dict):
             continue
-        f_ok, f_bad, f_resyncs = iter_frames(sample, f, enable_checksum=True)
+        if memo is None:
+            f_ok, f_bad, f_resyncs = iter_frames(sample, compile_frame_spec(f), enable_checksum=True)
+        else:
+            key = _frame_sniff_key(f)
+            hit = memo.get(key)
+            if hit is None:
+                hit = memo[key] = iter_frames(sample, compile_frame_spec(f), enable_checksum=True)
+            f_ok, f_bad, f_resyncs = hit
         ok += f_ok
         bad += f_bad
         resyncs += f_resyncs
@@ -315,40 +658,100 @@ def score_to_confidence(frames_ok: int, frames_bad: int) -> float:
     return min(0.99, 0.2 + 0.79 * (frames_ok / (total + 1e-9)))
 
 
+def _score_candidates(
+    paths: List[Path], sample: bytes, memo: Dict[str, Tuple[int, int, int]]
+) -> List[Tuple[int, int, int]]:
+    """
+    sniff_score_protocol for each path, in order. Large samples go through the
+    nogil scan kernel, so candidates are scored on a thread pool sharing the
+    one sample buffer; small samples are cheaper to score inline.
+    """
+    if len(paths) > 1 and len(sample) >= _SNIFF_ACCEL_MIN_BYTES and _sniff_scan_kernel() is not None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as pool:
+            return list(pool.map(lambda p: sniff_score_protocol(p, sample, memo), paths))
+    return [sniff_score_protocol(p, sample, memo) for p in paths]
+
+
+def _count_header(sample: Any, header: bytes) -> int:
+    # Non-overlapping occurrences, as bytes.count; mmap has find() but no count().
+    if isinstance(sample, bytes):
+        return sample.count(header)
+    n = 0
+    pos = sample.find(header)
+    while pos >= 0:
+        n += 1
+        pos = sample.find(header, pos + len(header))
+    return n
+
+
+def _sniff_ok_bound(protocol_json_path: Path, sample: bytes, counts: Dict[bytes, int]) -> Optional[int]:
+    """
+    Upper bound on sniff frames_ok: every accepted frame starts at a distinct
+    header occurrence, counted with bytes.count (once per distinct header via
+    `counts`). None when a header can overlap itself (bytes.count would
+    undercount occurrences).
+    """
+    doc = load_protocol_json(protocol_json_path)
+    frames = doc.get("frames", [])
+    if not isinstance(frames, list):
+        return 0
+    bound = 0
+    for f in frames:
+        if not isinstance(f, dict):
+            continue
+        header = compile_frame_spec(f).header
+        if any(header[:k] == header[-k:] for k in range(1, len(header))):
+            return None
+        if header not in counts:
+            counts[header] = _count_header(sample, header)
+        bound += counts[header]
+    return bound
+
+
 def pick_by_sniff(
     candidates: List[Tuple[str, str, Path]], sample: bytes
-) -> Tuple[Optional[DetectionResult], List[dict], bool]:
-    scored: List[dict] = []
-    for pid, ver, path in candidates:
-        ok, bad, resyncs = sniff_score_protocol(path, sample)
-        score = ok * 100 - bad * 50 - resyncs
-        scored.append(
-            {
-                "protocol_id": pid,
-                "protocol_version": ver,
-                "protocol_json": str(path),
-                "frames_ok": ok,
-                "frames_bad_checksum": bad,
-                "resyncs": resyncs,
-                "score": score,
-            }
-        )
-    scored.sort(key=lambda x: int(x["score"]), reverse=True)
-    if not scored or scored[0]["frames_ok"] <= 0:
+) -> Tuple[Optional[DetectionResult], List[SniffScore], bool]:
+    # Score the candidate with the most header hits first; any candidate whose
+    # best possible score (100 per header hit) is more than the ambiguity margin
+    # below it can neither win nor make the result ambiguous, so it is skipped
+    # and left out of the returned rows.
+    header_counts: Dict[bytes, int] = {}
+    memo: Dict[str, Tuple[int, int, int]] = {}
+    bounds = [_sniff_ok_bound(path, sample, header_counts) for _, _, path in candidates]
+    order = sorted(range(len(candidates)), key=lambda i: -1 if bounds[i] is None else bounds[i], reverse=True)
+    scores: Dict[int, Tuple[int, int, int]] = {}
+    if order:
+        lead = order[0]
+        scores[lead] = sniff_score_protocol(candidates[lead][2], sample, memo)
+        ok, bad, resyncs = scores[lead]
+        floor = ok * 100 - bad * 50 - resyncs - 50
+        rest = [i for i in order[1:] if bounds[i] is None or bounds[i] * 100 >= floor]
+        scores.update(zip(rest, _score_candidates([candidates[i][2] for i in rest], sample, memo)))
+
+    scored: List[SniffScore] = []
+    for i, (pid, ver, path) in enumerate(candidates):
+        if i not in scores:
+            continue
+        ok, bad, resyncs = scores[i]
+        scored.append(SniffScore(pid, ver, str(path), ok, bad, resyncs, ok * 100 - bad * 50 - resyncs))
+    scored.sort(key=attrgetter("score"), reverse=True)
+    if not scored or scored[0].frames_ok <= 0:
         return None, scored, False
 
     best = scored[0]
     ambiguous = False
-    if len(scored) > 1 and scored[1]["frames_ok"] > 0:
+    if len(scored) > 1 and scored[1].frames_ok > 0:
         # If second-best is too close, treat as ambiguous.
-        if best["score"] - scored[1]["score"] < 50:
+        if best.score - scored[1].score < 50:
             ambiguous = True
 
     res = DetectionResult(
-        protocol_id=best["protocol_id"],
-        protocol_version=best["protocol_version"],
+        protocol_id=best.protocol_id,
+        protocol_version=best.protocol_version,
         model_id=None,
-        confidence=score_to_confidence(int(best["frames_ok"]), int(best["frames_bad_checksum"])),
+        confidence=score_to_confidence(best.frames_ok, best.frames_bad_checksum),
         rule_id="sniff_protocol_assets" + (":ambiguous" if ambiguous else ""),
         method="sniff",
     )
@@ -360,6 +763,9 @@ def apply_query_rule(rule: dict, ser: Any) -> Optional[DetectionResult]:
     Minimal query rule support:
     rule.query.tx_hex: ["0xAA", ...]
     rule.query.rx_regex: "..."
+    rule.query.max_match_chars: N (optional; longest reply text a match can
+      span, lookarounds included. Each read then rescans only the last N
+      already-searched chars instead of the whole reply.)
     """
     query = rule.get("query", {})
     tx = query.get("tx_hex")
@@ -374,13 +780,19 @@ def apply_query_rule(rule: dict, ser: Any) -> Optional[DetectionResult]:
 
     timeout_ms = int(query.get("timeout_ms", 800))
     end = time.time() + timeout_ms / 1000.0
-    chunks: List[bytes] = []
+    rx = _rule_regex(str(rx_regex))
+    window = int(query.get("max_match_chars", 0))
+    # Decode only the new bytes each read (a split UTF-8 sequence waits for its tail).
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    text = ""
+    searched = 0
     while time.time() < end:
         data = ser.read(4096)
         if data:
-            chunks.append(data)
-            text = b"".join(chunks).decode("utf-8", errors="ignore")
-            m = re.search(rx_regex, text, flags=re.MULTILINE)
+            text += decoder.decode(data)
+            # search(text, pos) rather than a slice: ^ and lookbehinds still see the earlier text.
+            m = rx.search(text, max(0, searched - window) if window > 0 else 0)
+            searched = len(text)
             if m:
                 groups = {k: v for k, v in m.groupdict().items() if v is not None}
                 out_cfg = rule.get("outputs", {})
@@ -400,13 +812,15 @@ def apply_query_rule(rule: dict, ser: Any) -> Optional[DetectionResult]:
     return None
 
 
+# Tie-break for equal confidence: prefer sniff over banner over query.
+_METHOD_RANK = {"sniff": 2, "banner": 1, "query": 0}
+
+
 def choose_best(results: List[DetectionResult]) -> Optional[DetectionResult]:
     if not results:
         return None
-    # Sort by confidence desc, then prefer sniff over banner over query only if confidence ties.
-    method_rank = {"sniff": 2, "banner": 1, "query": 0}
-    results_sorted = sorted(results, key=lambda r: (r.confidence, method_rank.get(r.method, 0)), reverse=True)
-    return results_sorted[0]
+    # Highest (confidence, method rank); max keeps the first of equal keys, as the stable sort did.
+    return max(results, key=lambda r: (r.confidence, _METHOD_RANK.get(r.method, 0)))
 
 
 def ensure_run_id(run_id: Optional[str]) -> str:
@@ -422,9 +836,9 @@ def ensure_evidence_dir(dvk_root: Path, device_serial: str, run_id: str) -> Path
 
 
 def load_or_init_run(run_file: Path, run_id: str) -> dict:
-    yaml = _require_yaml()
+    yaml, loader, _ = _yaml_codec()
     if run_file.exists():
-        return yaml.safe_load(run_file.read_text(encoding="utf-8")) or {}
+        return yaml.load(run_file.read_text(encoding="utf-8"), Loader=loader) or {}
     return {
         "run_id": run_id,
         "created_at": datetime.now().isoformat(timespec="seconds"),
@@ -440,6 +854,70 @@ def append_device(run: dict, device_entry: dict) -> None:
     run["devices"].append(device_entry)
 
 
+def _run_append_state_path(run_file: Path) -> Path:
+    return run_file.with_name(f".{run_file.name}.append.json")
+
+
+def _write_run_append_state(run_file: Path, offset: int) -> None:
+    # Best effort, like the protocol index: without it the next append re-parses the run.
+    state = _run_append_state_path(run_file)
+    try:
+        if offset < 0:
+            state.unlink(missing_ok=True)
+            return
+        st = run_file.stat()
+        state.write_text(json.dumps({"mtime_ns": st.st_mtime_ns, "size": st.st_size, "offset": offset}), encoding="utf-8")
+    except OSError:
+        pass
+
+
+def dump_run(run_file: Path, run: dict) -> None:
+    """
+    dump_yaml for a run record. Also records (in a hidden sidecar next to it)
+    the text offset right after the last `devices` entry, so the next
+    append_device_to_run can splice in one entry instead of re-parsing and
+    re-serializing every device.
+    """
+    yaml, _, dumper = _yaml_codec()
+    text = yaml.dump(run, Dumper=dumper, sort_keys=False, allow_unicode=True)
+    run_file.parent.mkdir(parents=True, exist_ok=True)
+    run_file.write_text(text, encoding="utf-8")
+
+    offset = -1
+    keys = list(run)
+    if "devices" in keys and isinstance(run["devices"], list) and run["devices"]:
+        # Block-style mapping: the keys after `devices` dump to exactly the text tail
+        # (anchors shared across keys would not, and then no offset is recorded).
+        tail = {k: run[k] for k in keys[keys.index("devices") + 1 :]}
+        tail_text = yaml.dump(tail, Dumper=dumper, sort_keys=False, allow_unicode=True) if tail else ""
+        if text.endswith(tail_text):
+            offset = len(text) - len(tail_text)
+    _write_run_append_state(run_file, offset)
+
+
+def append_device_to_run(run_file: Path, run_id: str, device_entry: dict) -> None:
+    """Append one device to the run record (created if missing) and write it back."""
+    try:
+        st = run_file.stat()
+        state = json.loads(_run_append_state_path(run_file).read_text(encoding="utf-8"))
+        fresh = state["mtime_ns"] == st.st_mtime_ns and state["size"] == st.st_size
+    except (OSError, ValueError, TypeError, KeyError):
+        fresh = False
+    if fresh:
+        text = run_file.read_text(encoding="utf-8")
+        offset = int(state["offset"])
+        if 0 < offset <= len(text) and text[offset - 1] == "\n":
+            yaml, _, dumper = _yaml_codec()
+            item = yaml.dump([device_entry], Dumper=dumper, sort_keys=False, allow_unicode=True)
+            run_file.write_text(text[:offset] + item + text[offset:], encoding="utf-8")
+            _write_run_append_state(run_file, offset + len(item))
+            return
+
+    run = load_or_init_run(run_file, run_id)
+    append_device(run, device_entry)
+    dump_run(run_file, run)
+
+
 def cmd_uart(args: argparse.Namespace) -> None:
     os.environ.setdefault("PYTHONUTF8", "1")
     serial = _require_serial()
@@ -475,28 +953,35 @@ def cmd_uart(args: argparse.Namespace) -> None:
                 banner_ms = max(banner_ms, int((r.get("inputs") or {}).get("read_window_ms", 0)))
         banner_text = ""
         if banner_ms > 0:
+            # Let read() block on the window instead of polling with sleeps. A short
+            # read means the timeout ran out; the port timeout is only reconfigured
+            # (a driver call) after a full 4 KiB chunk, to the time that is left.
             end = time.time() + banner_ms / 1000.0
-            chunks: List[bytes] = []
-            while time.time() < end:
-                data = ser.read(4096)
-                if data:
-                    chunks.append(data)
-                time.sleep(0.02)
-            banner_text = b"".join(chunks).decode("utf-8", errors="ignore")
+            banner = bytearray()
+            read_timeout = ser.timeout
+            try:
+                ser.timeout = banner_ms / 1000.0
+                while True:
+                    chunk = ser.read(4096)
+                    banner += chunk
+                    remaining = end - time.time()
+                    if len(chunk) < 4096 or remaining <= 0:
+                        break
+                    ser.timeout = remaining
+            finally:
+                ser.timeout = read_timeout
+            banner_text = banner.decode("utf-8", errors="ignore")
             (evidence_dir / "banner.txt").write_text(banner_text, encoding="utf-8")
 
         # Sniff capture (fixed minimum; sniff uses protocol assets, not rules).
         sniff_min = int(args.sample_bytes)
         sniff_bytes = b""
         if sniff_min > 0:
-            chunks = []
-            while sum(len(c) for c in chunks) < sniff_min:
-                data = ser.read(4096)
-                if data:
-                    chunks.append(data)
-                else:
-                    time.sleep(0.02)
-            sniff_bytes = b"".join(chunks)
+            # read() already blocks up to the port timeout when the line is idle.
+            sniff = bytearray()
+            while len(sniff) < sniff_min:
+                sniff += ser.read(4096)
+            sniff_bytes = bytes(sniff)
             (evidence_dir / "sniff.bin").write_bytes(sniff_bytes)
 
         results: List[DetectionResult] = []
@@ -518,33 +1003,30 @@ def cmd_uart(args: argparse.Namespace) -> None:
 
         model_id = args.model_id or matched_groups.get("model_id") or (best.model_id if best else None)
 
-        candidates = list_protocol_candidates(dvk_root)
-        if model_id:
-            model_doc = load_model_doc(dvk_root, model_id)
-            refs = protocol_refs_for_model(model_doc)
-            allowed_ids = {pid for pid, _ in refs}
-            if allowed_ids:
-                candidates = [c for c in candidates if c[0] in allowed_ids]
-                # If the model specifies an expected version, filter by it.
-                expected_by_id = {pid: ver for pid, ver in refs if ver}
-                if expected_by_id:
-                    candidates = [
-                        c for c in candidates
-                        if (c[0] not in expected_by_id) or (c[1] == expected_by_id[c[0]])
-                    ]
-                # If only one protocol is compatible, select without sniffing.
-                if len(candidates) == 1 and not best:
-                    pid, ver, _ = candidates[0]
-                    best = DetectionResult(
-                        protocol_id=pid,
-                        protocol_version=ver,
-                        model_id=model_id,
-                        confidence=0.9,
-                        rule_id="model_file_single",
-                        method="model_file",
-                    )
-
-        sniff_scored: List[dict] = []
+        refs = protocol_refs_for_model(load_model_doc(dvk_root, model_id)) if model_id else []
+        allowed_ids = {pid for pid, _ in refs}
+        candidates = list_protocol_candidates(dvk_root, allowed_ids)
+        if allowed_ids:
+            # If the model specifies an expected version, filter by it.
+            expected_by_id = {pid: ver for pid, ver in refs if ver}
+            if expected_by_id:
+                candidates = [
+                    c for c in candidates
+                    if (c[0] not in expected_by_id) or (c[1] == expected_by_id[c[0]])
+                ]
+            # If only one protocol is compatible, select without sniffing.
+            if len(candidates) == 1 and not best:
+                pid, ver, _ = candidates[0]
+                best = DetectionResult(
+                    protocol_id=pid,
+                    protocol_version=ver,
+                    model_id=model_id,
+                    confidence=0.9,
+                    rule_id="model_file_single",
+                    method="model_file",
+                )
+
+        sniff_scored: List[SniffScore] = []
         sniff_ambiguous = False
         if not best:
             sniff_best, sniff_scored, sniff_ambiguous = pick_by_sniff(
@@ -562,7 +1044,6 @@ def cmd_uart(args: argparse.Namespace) -> None:
 
     # Build / append run record.
     run_file = Path(args.run_file) if args.run_file else (dvk_root / "runs" / f"{run_id}.yaml")
-    run = load_or_init_run(run_file, run_id)
 
     device_entry: Dict[str, Any] = {
         "device_serial": device_serial,
@@ -588,7 +1069,7 @@ def cmd_uart(args: argparse.Namespace) -> None:
         },
     }
     if sniff_scored:
-        device_entry["detection"]["candidates"] = sniff_scored[:10]
+        device_entry["detection"]["candidates"] = [c.as_dict() for c in sniff_scored[:10]]
         device_entry["detection"]["ambiguous"] = bool(sniff_ambiguous)
 
     # If sniff is ambiguous and user didn't allow it, write run record but force manual decision.
@@ -601,16 +1082,14 @@ def cmd_uart(args: argparse.Namespace) -> None:
             "method": "sniff",
         }
         device_entry["detection"]["recommendations"] = [
-            f"{c['protocol_id']}@{c['protocol_version']}" for c in (sniff_scored[:5] if sniff_scored else [])
+            f"{c.protocol_id}@{c.protocol_version}" for c in sniff_scored[:5]
         ]
-        append_device(run, device_entry)
-        dump_yaml(run_file, run)
+        append_device_to_run(run_file, run_id, device_entry)
         print(f"run_file: {run_file}")
         print(f"device_serial: {device_serial}")
         print("Ambiguous sniff result. Provide --model-id to restrict candidates, or choose one protocol manually.")
         raise SystemExit(2)
-    append_device(run, device_entry)
-    dump_yaml(run_file, run)
+    append_device_to_run(run_file, run_id, device_entry)
 
     print(f"run_file: {run_file}")
     print(f"device_serial: {device_serial}")
@@ -628,30 +1107,41 @@ def cmd_file(args: argparse.Namespace) -> None:
     sample_path = Path(args.sample)
     if not sample_path.exists():
         raise SystemExit(f"Sample not found: {sample_path}")
-    sample = sample_path.read_bytes()
-    (evidence_dir / "sniff.bin").write_bytes(sample)
+    # Evidence copy is done by the kernel (copy_file_range/sendfile); the sample
+    # itself is scanned through a read-only mapping instead of a heap copy.
+    try:
+        shutil.copyfile(sample_path, evidence_dir / "sniff.bin")
+    except shutil.SameFileError:
+        pass
+    with open(sample_path, "rb") as f:
+        try:
+            sample: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            sample = b""
 
     model_id = args.model_id
-    candidates = list_protocol_candidates(dvk_root)
-    if model_id:
-        model_doc = load_model_doc(dvk_root, model_id)
-        refs = protocol_refs_for_model(model_doc)
-        allowed_ids = {pid for pid, _ in refs}
-        if allowed_ids:
-            candidates = [c for c in candidates if c[0] in allowed_ids]
-            expected_by_id = {pid: ver for pid, ver in refs if ver}
-            if expected_by_id:
-                candidates = [
-                    c for c in candidates
-                    if (c[0] not in expected_by_id) or (c[1] == expected_by_id[c[0]])
-                ]
+    refs = protocol_refs_for_model(load_model_doc(dvk_root, model_id)) if model_id else []
+    allowed_ids = {pid for pid, _ in refs}
+    candidates = list_protocol_candidates(dvk_root, allowed_ids)
+    if allowed_ids:
+        expected_by_id = {pid: ver for pid, ver in refs if ver}
+        if expected_by_id:
+            candidates = [
+                c for c in candidates
+                if (c[0] not in expected_by_id) or (c[1] == expected_by_id[c[0]])
+            ]
 
-    sniff_best, sniff_scored, sniff_ambiguous = pick_by_sniff([(pid, ver, p) for pid, ver, p in candidates], sample)
+    try:
+        sniff_best, sniff_scored, sniff_ambiguous = pick_by_sniff(
+            [(pid, ver, p) for pid, ver, p in candidates], sample
+        )
+    finally:
+        if isinstance(sample, mmap.mmap):
+            sample.close()
     if not sniff_best:
         raise SystemExit(f"Protocol not detected from sample. Evidence: {evidence_dir}")
 
     run_file = Path(args.run_file) if args.run_file else (dvk_root / "runs" / f"{run_id}.yaml")
-    run = load_or_init_run(run_file, run_id)
 
     device_entry: Dict[str, Any] = {
         "device_serial": device_serial,
@@ -667,7 +1157,7 @@ def cmd_file(args: argparse.Namespace) -> None:
                 "method": sniff_best.method,
             },
             "evidence": {"sniff_sample": str((evidence_dir / "sniff.bin"))},
-            "candidates": sniff_scored[:10],
+            "candidates": [c.as_dict() for c in sniff_scored[:10]],
             "ambiguous": bool(sniff_ambiguous),
         },
     }
@@ -681,17 +1171,15 @@ def cmd_file(args: argparse.Namespace) -> None:
             "method": "sniff",
         }
         device_entry["detection"]["recommendations"] = [
-            f"{c['protocol_id']}@{c['protocol_version']}" for c in (sniff_scored[:5] if sniff_scored else [])
+            f"{c.protocol_id}@{c.protocol_version}" for c in sniff_scored[:5]
         ]
-        append_device(run, device_entry)
-        dump_yaml(run_file, run)
+        append_device_to_run(run_file, run_id, device_entry)
         print(f"run_file: {run_file}")
         print(f"device_serial: {device_serial}")
         print("Ambiguous sniff result. Provide --model-id to restrict candidates, or choose one protocol manually.")
         raise SystemExit(2)
 
-    append_device(run, device_entry)
-    dump_yaml(run_file, run)
+    append_device_to_run(run_file, run_id, device_entry)
     print(f"run_file: {run_file}")
     print(f"device_serial: {device_serial}")
     print(f"detected: {sniff_best.protocol_id}@{sniff_best.protocol_version} (confidence={sniff_best.confidence}, rule={sniff_best.rule_id}, method={sniff_best.method})")
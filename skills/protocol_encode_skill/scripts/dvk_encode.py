@@ -13,160 +13,299 @@ import os
 import struct
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import yaml
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 def find_dvk_root(start: Path) -> Path:
     """Find DVK root by locating .claude-plugin/plugin.json marker file."""
-    current = start.resolve()
-    for parent in [current, *current.parents]:
-        if (parent / ".claude-plugin" / "plugin.json").exists():
-            return parent
+    env_root = os.environ.get("DVK_ROOT")  # not cached: may change between calls
+    if env_root and os.path.isfile(os.path.join(env_root, ".claude-plugin", "plugin.json")):
+        return Path(env_root)
+    return _walk_to_dvk_root(start)
+
+
+@lru_cache(maxsize=8)
+def _walk_to_dvk_root(start: Path) -> Path:
+    current = str(start.resolve())
+    while True:
+        if os.path.isfile(os.path.join(current, ".claude-plugin", "plugin.json")):
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
     raise SystemExit("Cannot locate DVK root (missing .claude-plugin/plugin.json)")
 
 
+sys.path.insert(0, str(find_dvk_root(Path(__file__).parent)))
+
+# Shared checksum kernels (CRC: zlib/binascii for well-known polynomials, table-driven otherwise).
+from dvk.checksums import checksum_sum8, crc_compute  # noqa: E402
+
+
 def load_commands(commands_path: Path) -> dict:
     try:
-        return yaml.safe_load(commands_path.read_text(encoding="utf-8"))
+        st = commands_path.stat()
     except FileNotFoundError:
         raise SystemExit(f"commands.yaml not found: {commands_path}")
+    return _parse_commands(str(commands_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=1)
+def _yaml() -> Any:
+    # Deferred: a fresh JSON sidecar means the YAML parser is never imported.
+    import yaml  # type: ignore
+
+    return yaml
+
+
+def _commands_sidecar_path(commands_path: Path) -> Path:
+    return commands_path.with_name(f".{commands_path.name}.json")
+
+
+def _to_json_tree(obj: Any) -> Any:
+    # JSON object keys are strings only; YAML mappings with other keys (e.g. `enum: {0: idle}`)
+    # are stored as {"__pairs__": [[k, v], ...]} so the sidecar loads back to the same dict.
+    if isinstance(obj, dict):
+        if all(isinstance(k, str) for k in obj) and "__pairs__" not in obj:
+            return {k: _to_json_tree(v) for k, v in obj.items()}
+        return {"__pairs__": [[k, _to_json_tree(v)] for k, v in obj.items()]}
+    if isinstance(obj, list):
+        return [_to_json_tree(v) for v in obj]
+    return obj
+
+
+def _from_json_object(obj: dict) -> Any:
+    if len(obj) == 1 and "__pairs__" in obj:
+        return {k: v for k, v in obj["__pairs__"]}
+    return obj
+
+
+def _write_commands_sidecar(commands_path: Path, mtime_ns: int, size: int, data: Any) -> None:
+    # Best effort, like the protocol index: a read-only spec dir just means YAML is parsed each run.
+    # Only written when the JSON form loads back equal (dates or NaN would not).
+    sidecar = _commands_sidecar_path(commands_path)
+    try:
+        text = json.dumps({"mtime_ns": mtime_ns, "size": size, "data": _to_json_tree(data)}, ensure_ascii=False)
+        if json.loads(text, object_hook=_from_json_object)["data"] != data:
+            return
+        tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, sidecar)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+@lru_cache(maxsize=16)
+def _parse_commands(path: str, mtime_ns: int, size: int) -> dict:
+    # Keyed by (mtime_ns, size) so batch callers in one process parse each file once;
+    # an edited file gets a new key. The returned dict is shared: treat it as read-only.
+    commands_path = Path(path)
+    try:
+        cached = json.loads(_commands_sidecar_path(commands_path).read_text(encoding="utf-8"), object_hook=_from_json_object)
+        if cached["mtime_ns"] == mtime_ns and cached["size"] == size:
+            return cached["data"]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+
+    yaml = _yaml()
+    try:
+        # libyaml-backed loader when PyYAML was built with it (same safe subset, parsed in C).
+        data = yaml.load(commands_path.read_text(encoding="utf-8"), Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    except FileNotFoundError:
+        raise SystemExit(f"commands.yaml not found: {path}")
     except yaml.YAMLError as e:
-        raise SystemExit(f"Invalid YAML in {commands_path}: {e}")
+        raise SystemExit(f"Invalid YAML in {path}: {e}")
+    _write_commands_sidecar(commands_path, mtime_ns, size, data)
+    return data
 
 
 def load_protocol(protocol_path: Path) -> dict:
     try:
-        return json.loads(protocol_path.read_text(encoding="utf-8"))
+        st = protocol_path.stat()
     except FileNotFoundError:
         raise SystemExit(f"protocol.json not found: {protocol_path}")
+    return _parse_protocol(str(protocol_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=16)
+def _parse_protocol(path: str, mtime_ns: int, size: int) -> dict:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise SystemExit(f"protocol.json not found: {path}")
     except json.JSONDecodeError as e:
-        raise SystemExit(f"Invalid JSON in {protocol_path}: {e}")
+        raise SystemExit(f"Invalid JSON in {path}: {e}")
+
+
+# Integer field types -> (struct format, mask). Signed types use mask -1 (x & -1 == x),
+# so out-of-range values still raise struct.error instead of wrapping.
+_INT_FORMATS: Dict[str, Tuple[str, int]] = {
+    "uint8": ("B", 0xFF),
+    "int8": ("b", -1),
+    "uint16_le": ("<H", 0xFFFF),
+    "uint16_be": (">H", 0xFFFF),
+    "int16_le": ("<h", -1),
+    "int16_be": (">h", -1),
+    "uint32_le": ("<I", 0xFFFFFFFF),
+    "uint32_be": (">I", 0xFFFFFFFF),
+    "int32_le": ("<i", -1),
+    "int32_be": (">i", -1),
+}
+_FLOAT_FORMATS: Dict[str, str] = {"float32_le": "<f", "float32_be": ">f"}
+
+_INT_PACKERS: Dict[str, Tuple[Callable[..., bytes], int]] = {
+    k: (struct.Struct(fmt).pack, mask) for k, (fmt, mask) in _INT_FORMATS.items()
+}
+_FLOAT_PACKERS: Dict[str, Callable[..., bytes]] = {k: struct.Struct(fmt).pack for k, fmt in _FLOAT_FORMATS.items()}
+_CHECKSUM_PACKERS = {k: _INT_PACKERS[k] for k in ("uint8", "uint16_le", "uint16_be", "uint32_le", "uint32_be")}
 
 
 def encode_value(value: Any, value_type: str) -> bytes:
     """Encode a value to bytes based on type."""
-    if value_type == "uint8":
-        return struct.pack("B", int(value) & 0xFF)
-    elif value_type == "int8":
-        return struct.pack("b", int(value))
-    elif value_type == "uint16_le":
-        return struct.pack("<H", int(value) & 0xFFFF)
-    elif value_type == "uint16_be":
-        return struct.pack(">H", int(value) & 0xFFFF)
-    elif value_type == "int16_le":
-        return struct.pack("<h", int(value))
-    elif value_type == "int16_be":
-        return struct.pack(">h", int(value))
-    elif value_type == "uint32_le":
-        return struct.pack("<I", int(value) & 0xFFFFFFFF)
-    elif value_type == "uint32_be":
-        return struct.pack(">I", int(value) & 0xFFFFFFFF)
-    elif value_type == "int32_le":
-        return struct.pack("<i", int(value))
-    elif value_type == "int32_be":
-        return struct.pack(">i", int(value))
-    elif value_type == "float32_le":
-        return struct.pack("<f", float(value))
-    elif value_type == "float32_be":
-        return struct.pack(">f", float(value))
-    elif value_type == "bytes":
+    packer = _INT_PACKERS.get(value_type)
+    if packer is not None:
+        pack, mask = packer
+        return pack(int(value) & mask)
+    pack = _FLOAT_PACKERS.get(value_type)
+    if pack is not None:
+        return pack(float(value))
+    if value_type == "bytes":
         if isinstance(value, str):
             return bytes.fromhex(value)
         return bytes(value)
-    else:
-        raise ValueError(f"Unsupported type: {value_type}")
-
-
-def find_command(commands_data: dict, selector: str) -> Optional[dict]:
-    """Find command by name or hex ID."""
-    commands = commands_data.get("commands", [])
-    for cmd in commands:
-        if cmd.get("name") == selector:
-            return cmd
-        cmd_id = cmd.get("id")
-        if isinstance(cmd_id, int) and selector.lower().startswith("0x"):
-            if cmd_id == int(selector, 16):
-                return cmd
-        elif str(cmd_id) == selector:
-            return cmd
-    return None
-
-
-def build_payload(command: dict, params: Dict[str, Any]) -> bytes:
-    """Build payload bytes from command definition and user params."""
-    payload_def = command.get("payload", [])
-    result = bytearray()
-
-    for field in payload_def:
-        name = field["name"]
-        ftype = field.get("type", "uint8")
-
-        if name not in params:
-            raise ValueError(f"Missing required param: {name}")
+    raise ValueError(f"Unsupported type: {value_type}")
 
-        value = params[name]
-        result.extend(encode_value(value, ftype))
 
-    return bytes(result)
+def _memo_by_id(cache: Dict[int, Tuple[dict, Any]], obj: dict, build: Callable[[dict], Any]) -> Any:
+    """Memoize `build(obj)` per dict object (keyed by id(), holding the dict so the id is not reused)."""
+    hit = cache.get(id(obj))
+    if hit is not None and hit[0] is obj:
+        return hit[1]
+    value = build(obj)
+    if len(cache) >= 64:
+        cache.clear()
+    cache[id(obj)] = (obj, value)
+    return value
 
 
-def checksum_sum8(data: bytes, start: int, end: int) -> int:
-    return sum(data[start:end + 1]) & 0xFF
+_CommandIndex = Tuple[Dict[Any, int], Dict[str, int], Dict[int, int]]
+_COMMAND_INDEX: Dict[int, Tuple[dict, _CommandIndex]] = {}
 
 
-def reflect_bits(value: int, width: int) -> int:
-    result = 0
-    for i in range(width):
-        if value & (1 << i):
-            result |= 1 << (width - 1 - i)
-    return result
+def _build_command_index(commands_data: dict) -> _CommandIndex:
+    """name / str(id) / int id -> position of the first command carrying it."""
+    by_name: Dict[Any, int] = {}
+    by_str_id: Dict[str, int] = {}
+    by_int_id: Dict[int, int] = {}
+    for i, cmd in enumerate(commands_data.get("commands", [])):
+        by_name.setdefault(cmd.get("name"), i)
+        cmd_id = cmd.get("id")
+        if isinstance(cmd_id, int):
+            by_int_id.setdefault(cmd_id, i)
+        by_str_id.setdefault(str(cmd_id), i)
+    return by_name, by_str_id, by_int_id
 
 
-def crc_compute(data: bytes, width: int, poly: int, init: int, xorout: int, refin: bool, refout: bool) -> int:
-    mask = (1 << width) - 1
-    crc = init & mask
+def find_command(commands_data: dict, selector: str) -> Optional[dict]:
+    """Find command by name or hex ID."""
+    by_name, by_str_id, by_int_id = _memo_by_id(_COMMAND_INDEX, commands_data, _build_command_index)
+    # Same precedence as a linear scan: the first command matching by name or id wins.
+    hits = [by_name.get(selector), by_str_id.get(selector)]
+    if by_int_id and selector.lower().startswith("0x"):
+        try:
+            hits.append(by_int_id.get(int(selector, 16)))
+        except ValueError:
+            pass
+    hits = [i for i in hits if i is not None]
+    if not hits:
+        return None
+    return commands_data["commands"][min(hits)]
+
+
+# One step per run of fixed-width fields: (Struct.pack, [(name, mask or None for float)]),
+# or (None, [(name, type)]) for a field that goes through encode_value (bytes, unknown types).
+_PayloadPlan = List[Tuple[Optional[Callable[..., bytes]], List[Tuple[str, Any]]]]
+_PAYLOAD_PLANS: Dict[int, Tuple[dict, _PayloadPlan]] = {}
+
+
+def _build_payload_plan(command: dict) -> _PayloadPlan:
+    """
+    Group consecutive fixed-width fields of one byte order into a single Struct, so a
+    command with k numeric fields packs with one call instead of k. uint8/int8 have no
+    byte order and join any run.
+    """
+    plan: _PayloadPlan = []
+    order = ""
+    codes: List[str] = []
+    run: List[Tuple[str, Any]] = []
+
+    def flush() -> None:
+        nonlocal order
+        if run:
+            plan.append((struct.Struct((order or "<") + "".join(codes)).pack, run[:]))
+        order = ""
+        codes.clear()
+        run.clear()
+
+    for field in command.get("payload", []):
+        name = field["name"]
+        ftype = field.get("type", "uint8")
+        if ftype in _INT_FORMATS:
+            fmt, conv = _INT_FORMATS[ftype]
+        elif ftype in _FLOAT_FORMATS:
+            fmt, conv = _FLOAT_FORMATS[ftype], None
+        else:
+            flush()
+            plan.append((None, [(name, ftype)]))
+            continue
+        field_order, code = (fmt[0], fmt[1:]) if fmt[0] in "<>" else ("", fmt)
+        if field_order and order and field_order != order:
+            flush()
+        order = order or field_order
+        codes.append(code)
+        run.append((name, conv))
+    flush()
+    return plan
 
-    if refin:
-        for b in data:
-            crc ^= b
-            for _ in range(8):
-                if crc & 1:
-                    crc = (crc >> 1) ^ poly
-                else:
-                    crc >>= 1
-        crc &= mask
-    else:
-        topbit = 1 << (width - 1)
-        for b in data:
-            crc ^= (b << (width - 8)) & mask
-            for _ in range(8):
-                if crc & topbit:
-                    crc = ((crc << 1) ^ poly) & mask
-                else:
-                    crc = (crc << 1) & mask
 
-    if refout:
-        crc = reflect_bits(crc, width)
-    crc ^= xorout
-    return crc & mask
+def build_payload(command: dict, params: Dict[str, Any]) -> bytes:
+    """Build payload bytes from command definition and user params."""
+    parts: List[bytes] = []
+    for pack, fields in _memo_by_id(_PAYLOAD_PLANS, command, _build_payload_plan):
+        values = []
+        for name, conv in fields:
+            if name not in params:
+                raise ValueError(f"Missing required param: {name}")
+            value = params[name]
+            if pack is None:
+                parts.append(encode_value(value, conv))
+            elif conv is None:
+                values.append(float(value))
+            else:
+                values.append(int(value) & conv)
+        if pack is not None:
+            parts.append(pack(*values))
+    return parts[0] if len(parts) == 1 else b"".join(parts)
 
 
 def encode_checksum(checksum_val: int, store_format: str) -> bytes:
-    if store_format == "uint8":
-        return struct.pack("B", checksum_val & 0xFF)
-    elif store_format == "uint16_le":
-        return struct.pack("<H", checksum_val & 0xFFFF)
-    elif store_format == "uint16_be":
-        return struct.pack(">H", checksum_val & 0xFFFF)
-    elif store_format == "uint32_le":
-        return struct.pack("<I", checksum_val & 0xFFFFFFFF)
-    elif store_format == "uint32_be":
-        return struct.pack(">I", checksum_val & 0xFFFFFFFF)
-    else:
+    packer = _CHECKSUM_PACKERS.get(store_format)
+    if packer is None:
         raise ValueError(f"Unsupported store_format: {store_format}")
+    pack, mask = packer
+    return pack(checksum_val & mask)
+
+
+@lru_cache(maxsize=16)
+def _header_bytes(header: Tuple[Any, ...]) -> bytes:
+    out = bytearray()
+    for token in header:
+        if isinstance(token, str) and token.lower().startswith("0x"):
+            out.append(int(token, 16))
+    return bytes(out)
 
 
 def build_frame(
@@ -176,33 +315,30 @@ def build_frame(
     frame_spec: dict
 ) -> bytes:
     """Build a complete frame with header, length, msg_id, payload, and checksum."""
-    # Header bytes
-    header_bytes = bytearray()
-    for token in header:
-        if isinstance(token, str) and token.lower().startswith("0x"):
-            header_bytes.append(int(token, 16))
+    # Header bytes (parsed once per distinct header; batches reuse one frame spec)
+    try:
+        header_bytes = _header_bytes(tuple(header))
+    except TypeError:  # unhashable tokens: they are skipped anyway, parse without the cache
+        header_bytes = _header_bytes.__wrapped__(tuple(header))
 
     # Calculate frame structure based on typical pattern:
     # [header][length][msg_id][payload][checksum]
     length_spec = frame_spec.get("length", {})
     checksum_spec = frame_spec.get("checksum")
 
-    # Build frame without checksum first
-    frame = bytearray(header_bytes)
-
-    # Add length field (payload length for dynamic mode)
+    # Length field (payload length for dynamic mode)
+    length_bytes = b""
     mode = length_spec.get("mode", "fixed")
     if mode == "dynamic":
         field_def = length_spec.get("field", {})
         ftype = field_def.get("type", "uint8")
         # Length typically represents payload length
-        frame.extend(encode_value(len(payload), ftype))
+        length_bytes = encode_value(len(payload), ftype)
 
-    # Add msg_id
-    frame.extend(encode_value(msg_id, "uint8"))
+    msg_id_bytes = encode_value(msg_id, "uint8")
 
-    # Add payload
-    frame.extend(payload)
+    # One allocation for the body instead of growing a bytearray piece by piece.
+    frame = b"".join((header_bytes, length_bytes, msg_id_bytes, payload))
 
     # Add checksum if specified
     if checksum_spec:
@@ -219,12 +355,12 @@ def build_frame(
         end = rng["to"] if rng["to"] >= 0 else total_len + rng["to"]
 
         if ctype == "sum8":
-            checksum_val = checksum_sum8(bytes(frame), start, min(end, len(frame) - 1))
+            checksum_val = checksum_sum8(frame, start, min(end, len(frame) - 1))
         elif ctype in ("crc16", "crc32"):
             params = checksum_spec.get("params", {})
             width = 16 if ctype == "crc16" else 32
             checksum_val = crc_compute(
-                bytes(frame)[start:min(end + 1, len(frame))],
+                frame[start:min(end + 1, len(frame))],
                 width=width,
                 poly=params.get("poly", 0),
                 init=params.get("init", 0),
@@ -235,23 +371,59 @@ def build_frame(
         else:
             raise ValueError(f"Unsupported checksum type: {ctype}")
 
-        frame.extend(encode_checksum(checksum_val, store_format))
-
-    return bytes(frame)
+        frame += encode_checksum(checksum_val, store_format)
 
+    return frame
 
-def cmd_encode(args: argparse.Namespace) -> None:
-    dvk_root = find_dvk_root(Path(__file__).parent)
-    device_id = args.device_id
 
-    # Load commands.yaml
+def _commands_path(dvk_root: Path, args: argparse.Namespace) -> Path:
     if not args.commands:
         raise SystemExit("Missing --commands (expected: spec/command_sets/<command_set_id>/commands.yaml)")
     commands_path = Path(args.commands)
     if not commands_path.is_absolute():
         commands_path = dvk_root / commands_path
+    return commands_path
+
+
+def _select_frame_spec(dvk_root: Path, args: argparse.Namespace) -> dict:
+    if not args.protocol:
+        raise SystemExit("Missing --protocol (expected: spec/protocols/<protocol_id>/protocol.json)")
+    protocol_path = Path(args.protocol)
+    if not protocol_path.is_absolute():
+        protocol_path = dvk_root / protocol_path
+
+    protocol = load_protocol(protocol_path)
+    frames = protocol.get("frames", [])
+    if not frames:
+        raise SystemExit("protocol.json missing frames[]")
+
+    frame_spec = frames[0]
+    if args.frame_name:
+        frame_spec = next((f for f in frames if f.get("name") == args.frame_name), None)
+        if frame_spec is None:
+            raise SystemExit(f"Frame not found: {args.frame_name}")
+    return frame_spec
+
+
+def _command_msg_id(command: dict) -> int:
+    msg_id = command.get("id", 0)
+    if isinstance(msg_id, str) and msg_id.startswith("0x"):
+        msg_id = int(msg_id, 16)
+    return msg_id
+
+
+def _tx_frames_path(dvk_root: Path, device_id: str) -> Path:
+    raw_dir = dvk_root / "data" / "raw" / device_id
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    return raw_dir / "tx_frames.bin"
 
-    commands_data = load_commands(commands_path)
+
+def cmd_encode(args: argparse.Namespace) -> None:
+    dvk_root = find_dvk_root(Path(__file__).parent)
+    device_id = args.device_id
+
+    # Load commands.yaml
+    commands_data = load_commands(_commands_path(dvk_root, args))
 
     # Find command
     command = find_command(commands_data, args.command)
@@ -287,36 +459,13 @@ def cmd_encode(args: argparse.Namespace) -> None:
         print(f"Payload ({len(result)} bytes): {result.hex()}")
     else:
         # Full frame with header, length, checksum
-        if not args.protocol:
-            raise SystemExit("Missing --protocol (expected: spec/protocols/<protocol_id>/protocol.json)")
-        protocol_path = Path(args.protocol)
-        if not protocol_path.is_absolute():
-            protocol_path = dvk_root / protocol_path
-
-        protocol = load_protocol(protocol_path)
-        frames = protocol.get("frames", [])
-        if not frames:
-            raise SystemExit("protocol.json missing frames[]")
-
-        frame_spec = frames[0]
-        if args.frame_name:
-            frame_spec = next((f for f in frames if f.get("name") == args.frame_name), None)
-            if frame_spec is None:
-                raise SystemExit(f"Frame not found: {args.frame_name}")
-
-        header = frame_spec.get("header", [])
-        msg_id = command.get("id", 0)
-        if isinstance(msg_id, str) and msg_id.startswith("0x"):
-            msg_id = int(msg_id, 16)
-
-        result = build_frame(header, msg_id, payload, frame_spec)
+        frame_spec = _select_frame_spec(dvk_root, args)
+        result = build_frame(frame_spec.get("header", []), _command_msg_id(command), payload, frame_spec)
         print(f"Frame ({len(result)} bytes): {result.hex()}")
 
     # Save TX log if requested
     if args.save_tx:
-        raw_dir = dvk_root / "data" / "raw" / device_id
-        raw_dir.mkdir(parents=True, exist_ok=True)
-        tx_path = raw_dir / "tx_frames.bin"
+        tx_path = _tx_frames_path(dvk_root, device_id)
 
         # Append to existing file
         with tx_path.open("ab") as f:
@@ -335,19 +484,79 @@ def cmd_encode(args: argparse.Namespace) -> None:
         print(json.dumps(out, ensure_ascii=False))
 
 
+def cmd_encode_batch(args: argparse.Namespace) -> None:
+    """
+    Encode one command per JSONL record ({"command": "ping", "params": {"seq": 1}}).
+    Specs are loaded once and tx_frames.bin is opened once for the whole batch.
+    """
+    dvk_root = find_dvk_root(Path(__file__).parent)
+    commands_data = load_commands(_commands_path(dvk_root, args))
+    frame_spec = None if args.no_frame else _select_frame_spec(dvk_root, args)
+    header = frame_spec.get("header", []) if frame_spec is not None else []
+
+    if args.input == "-":
+        src = sys.stdin
+    else:
+        try:
+            src = open(args.input, "r", encoding="utf-8")
+        except OSError as e:
+            raise SystemExit(f"cannot open input: {args.input}: {e.strerror}")
+    tx = _tx_frames_path(dvk_root, args.device_id).open("ab", buffering=1024 * 1024) if args.save_tx else None
+    count = 0
+    try:
+        for lineno, line in enumerate(src, 1):
+            if not line.strip():
+                continue
+            where = f"{args.input}:{lineno}"
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise SystemExit(f"{where}: invalid JSON: {e}")
+            if not isinstance(rec, dict):
+                raise SystemExit(f"{where}: record must be a JSON object")
+            selector = str(rec.get("command", ""))
+            params = rec.get("params") or {}
+            if not isinstance(params, dict):
+                raise SystemExit(f"{where}: params must be a JSON object")
+            command = find_command(commands_data, selector)
+            if command is None:
+                raise SystemExit(f"{where}: command not found: {selector}")
+            try:
+                payload = build_payload(command, params)
+                result = payload if frame_spec is None else build_frame(header, _command_msg_id(command), payload, frame_spec)
+            except (ValueError, TypeError, struct.error) as e:
+                raise SystemExit(f"{where}: {e}")
+            if tx is not None:
+                tx.write(result)
+            count += 1
+
+            if args.json:
+                out = {
+                    "command": command.get("name"),
+                    "params": params,
+                    "payload_hex": payload.hex(),
+                    "frame_hex": result.hex() if frame_spec is not None else None,
+                    "length": len(result),
+                }
+                print(json.dumps(out, ensure_ascii=False))
+            else:
+                print(f"{'Payload' if frame_spec is None else 'Frame'} ({len(result)} bytes): {result.hex()}")
+    finally:
+        if tx is not None:
+            tx.close()
+        if src is not sys.stdin:
+            src.close()
+
+    if tx is not None:
+        print(f"Appended {count} frames to: {tx.name}", file=sys.stderr if args.json else sys.stdout)
+
+
 def cmd_list(args: argparse.Namespace) -> None:
     """List available commands."""
     dvk_root = find_dvk_root(Path(__file__).parent)
     device_id = args.device_id
 
-    if not args.commands:
-        raise SystemExit("Missing --commands (expected: spec/command_sets/<command_set_id>/commands.yaml)")
-    commands_path = Path(args.commands)
-    if not commands_path.is_absolute():
-        commands_path = dvk_root / commands_path
-
-    commands_data = load_commands(commands_path)
-
+    commands_data = load_commands(_commands_path(dvk_root, args))
     command_set_id = commands_data.get("command_set_id") or commands_data.get("device") or "unknown"
     print(f"Commands for {command_set_id} (device_id={device_id}):")
     for cmd in commands_data.get("commands", []):
@@ -381,6 +590,18 @@ def build_parser() -> argparse.ArgumentParser:
     enc.add_argument("--json", action="store_true", help="Output JSON format")
     enc.set_defaults(func=cmd_encode)
 
+    # encode-batch subcommand
+    bat = sub.add_parser("encode-batch", help="Encode one command per JSONL record")
+    bat.add_argument("--device-id", required=True, help="Device ID")
+    bat.add_argument("--input", default="-", help='JSONL file of {"command": ..., "params": {...}} records (default: stdin)')
+    bat.add_argument("--commands", required=True, help="Path to commands.yaml (e.g., spec/command_sets/<command_set_id>/commands.yaml)")
+    bat.add_argument("--protocol", help="Path to protocol.json (required unless --no-frame)")
+    bat.add_argument("--frame-name", help="Frame name to use")
+    bat.add_argument("--no-frame", action="store_true", help="Output payloads only, no framing")
+    bat.add_argument("--save-tx", action="store_true", help="Append all frames to tx_frames.bin")
+    bat.add_argument("--json", action="store_true", help="Output one JSON object per record")
+    bat.set_defaults(func=cmd_encode_batch)
+
     # list subcommand
     lst = sub.add_parser("list", help="List available commands")
     lst.add_argument("--device-id", required=True, help="Device ID")
@@ -11,18 +11,33 @@ import argparse
 import csv
 import json
 import os
+import re
 import time
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 
 def find_dvk_root(start: Path) -> Path:
     """Find DVK root by locating .claude-plugin/plugin.json marker file."""
-    current = start.resolve()
-    for parent in [current, *current.parents]:
-        if (parent / ".claude-plugin" / "plugin.json").exists():
-            return parent
+    env_root = os.environ.get("DVK_ROOT")
+    if env_root and os.path.isfile(os.path.join(env_root, ".claude-plugin", "plugin.json")):
+        return Path(env_root)
+    return _walk_to_dvk_root(start)
+
+
+@lru_cache(maxsize=8)
+def _walk_to_dvk_root(start: Path) -> Path:
+    current = str(start.resolve())
+    while True:
+        if os.path.isfile(os.path.join(current, ".claude-plugin", "plugin.json")):
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
     raise SystemExit("Cannot locate DVK root (missing .claude-plugin/plugin.json)")
 
 
@@ -40,6 +55,31 @@ def load_session_meta(dvk_root: Path, device_id: str) -> Optional[dict]:
     return None
 
 
+def _count_csv_data_lines(csv_path: Path) -> Optional[int]:
+    """
+    Count data records (lines after the header) with raw byte scans; bytes.count runs at
+    memchr speed instead of csv parsing every row. Returns None when the file has quotes
+    or bare CRs, where line count and record count can differ.
+    """
+    lines = 0
+    last = b""
+    with csv_path.open("rb") as f:
+        for buf in iter(lambda: f.read(1 << 20), b""):
+            if b'"' in buf:
+                return None
+            if last == b"\r" and buf[:1] != b"\n":
+                return None
+            if b"\r" in buf and buf.count(b"\r") != buf.count(b"\r\n") + (buf[-1:] == b"\r"):
+                return None
+            lines += buf.count(b"\n")
+            last = buf[-1:]
+    if last == b"\r":
+        return None
+    if last and last != b"\n":
+        lines += 1  # final record without a trailing newline
+    return max(lines - 1, 0)
+
+
 def load_decoded_csv_summary(dvk_root: Path, device_id: str, max_rows: int = 10) -> tuple[List[str], List[List[str]], int]:
     """Load decoded.csv and return (headers, sample_rows, total_count)."""
     csv_path = dvk_root / "data" / "processed" / device_id / "decoded.csv"
@@ -49,12 +89,11 @@ def load_decoded_csv_summary(dvk_root: Path, device_id: str, max_rows: int = 10)
     with csv_path.open("r", encoding="utf-8") as f:
         reader = csv.reader(f)
         headers = next(reader, [])
-        rows = []
-        count = 0
-        for row in reader:
-            count += 1
-            if len(rows) < max_rows:
-                rows.append(row)
+        # Parse only the sample; the total comes from a newline count unless quoting rules it out.
+        rows = list(islice(reader, max(max_rows, 0)))
+        count = _count_csv_data_lines(csv_path)
+        if count is None:
+            count = len(rows) + sum(1 for _ in reader)
 
     return headers, rows, count
 
@@ -64,10 +103,16 @@ def find_figures(reports_dir: Path) -> List[Path]:
     if not reports_dir.exists():
         return []
 
-    figures: List[Path] = []
-    for ext in ["*.png", "*.jpg", "*.svg"]:
-        figures.extend(reports_dir.glob(f"**/{ext}"))
-    return figures
+    # One os.walk instead of a recursive glob per extension; buckets keep the
+    # previous order (all .png, then .jpg, then .svg, each in walk order).
+    # Extensions compare case-insensitively, as Windows globbing did.
+    by_ext: Dict[str, List[Path]] = {".png": [], ".jpg": [], ".svg": []}
+    for root, _dirs, files in os.walk(reports_dir):
+        for name in files:
+            bucket = by_ext.get(os.path.splitext(name)[1].lower())
+            if bucket is not None:
+                bucket.append(Path(root, name))
+    return [fig for bucket in by_ext.values() for fig in bucket]
 
 
 def generate_markdown_report(
@@ -141,9 +186,8 @@ def generate_markdown_report(
         lines.append("| " + " | ".join(headers) + " |")
         lines.append("| " + " | ".join(["---"] * len(headers)) + " |")
 
-        # Table rows
-        for row in rows:
-            lines.append("| " + " | ".join(str(c) for c in row) + " |")
+        # Table rows (csv.reader cells are already str; join them directly)
+        lines.extend([f"| {' | '.join(row)} |" for row in rows])
         lines.append("")
 
     # Figures
@@ -188,6 +232,10 @@ def generate_markdown_report(
     return "\n".join(lines)
 
 
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+_CODE_TAGS = ("<code>", "</code>")
+
+
 def generate_html_report(markdown_content: str, device_id: str) -> str:
     """Convert markdown to simple HTML (basic conversion)."""
     lines = []
@@ -222,15 +270,16 @@ def generate_html_report(markdown_content: str, device_id: str) -> str:
                 lines.append("<table>")
                 in_table = True
             cells = [c.strip() for c in line.split("|")[1:-1]]
-            if all(c == "---" or c.startswith("-") for c in cells):
+            if all(c.startswith("-") for c in cells):
                 continue  # Skip separator row
-            tag = "th" if lines[-1] == "<table>" else "td"
-            row = "".join(f"<{tag}>{c}</{tag}>" for c in cells)
-            lines.append(f"<tr>{row}</tr>")
+            # One join per row: cells are separated by "</td><td>" (or th).
+            if lines[-1] == "<table>":
+                lines.append(f"<tr><th>{'</th><th>'.join(cells)}</th></tr>")
+            else:
+                lines.append(f"<tr><td>{'</td><td>'.join(cells)}</td></tr>")
         elif line.startswith("!["):
             # Image
-            import re
-            m = re.match(r"!\[([^\]]*)\]\(([^)]+)\)", line)
+            m = _IMAGE_RE.match(line)
             if m:
                 alt, src = m.groups()
                 lines.append(f"<img src='{src}' alt='{alt}'>")
@@ -248,12 +297,14 @@ def generate_html_report(markdown_content: str, device_id: str) -> str:
                 lines.append("</table>")
                 in_table = False
         else:
-            # Replace inline code
-            line = line.replace("`", "<code>", 1) if "`" in line else line
-            while "`" in line:
-                line = line.replace("`", "</code>", 1)
-                if "`" in line:
-                    line = line.replace("`", "<code>", 1)
+            # Replace inline code: backticks alternate <code>/</code> (one split, not a rescan per tick)
+            if "`" in line:
+                parts = line.split("`")
+                out = [parts[0]]
+                for i, part in enumerate(parts[1:]):
+                    out.append(_CODE_TAGS[i & 1])
+                    out.append(part)
+                line = "".join(out)
             lines.append(f"<p>{line}</p>")
 
     if in_table:
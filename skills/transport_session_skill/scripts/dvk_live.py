@@ -24,10 +24,14 @@ from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 def find_dvk_root(start: Path) -> Path:
-    current = start.resolve()
-    for parent in [current, *current.parents]:
-        if (parent / ".claude-plugin" / "plugin.json").exists():
-            return parent
+    current = str(start.resolve())
+    while True:
+        if os.path.isfile(os.path.join(current, ".claude-plugin", "plugin.json")):
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
     raise SystemExit("Cannot locate DVK root (missing .claude-plugin/plugin.json)")
 
 
@@ -129,8 +133,9 @@ class LengthSpec:
         return int(v) * self.unit_bytes + self.overhead_bytes
 
 
-def _decode_raw_fields(frame: bytes, frame_spec: dict) -> Dict[str, Any]:
-    # Minimal decoder (mirrors protocol_decode_skill behavior for common scalar types + bytes)
+def _decode_raw_fields(frame: bytes, frame_spec: dict, raw_bytes: bool = False) -> Dict[str, Any]:
+    # Minimal decoder (mirrors protocol_decode_skill behavior for common scalar types + bytes).
+    # raw_bytes=True keeps byte fields as bytes (for in-process semantics) instead of hex text.
     import struct
 
     def parse_value(data: bytes, value_type: str) -> Any:
@@ -144,8 +149,8 @@ def _decode_raw_fields(frame: bytes, frame_spec: dict) -> Dict[str, Any]:
             return struct.unpack("<I", data[:4])[0] if len(data) >= 4 else None
         if value_type == "uint32_be":
             return struct.unpack(">I", data[:4])[0] if len(data) >= 4 else None
-        if value_type == "bytes":
-            return data.hex()
+        if raw_bytes:
+            return bytes(data)
         return data.hex()
 
     def resolve_len(length_spec: Any, record: Dict[str, Any]) -> int:
@@ -298,25 +303,18 @@ def cmd_uart_publish(args: argparse.Namespace) -> None:
 
         try:
             for frame in _iter_framed_bytes(read_chunk, header, length_spec, checksum_spec):
-                raw = _decode_raw_fields(frame, frame_spec)
+                raw = _decode_raw_fields(frame, frame_spec, raw_bytes=True)
                 raw["_frame_idx"] = frame_idx
                 raw["_frame_name"] = frame_spec.get("name")
                 frame_idx += 1
 
                 if commands_doc:
-                    sem = apply_semantics([raw], commands=commands_doc)
-                    if sem.applied:
-                        # Convert to x/y on the fly
-                        import math
-                        pts = []
-                        for p in sem.records:
-                            ang = float(p.get("angle_deg", 0.0))
-                            dist = float(p.get("distance_raw", 0.0))
-                            th = math.radians(ang)
-                            p["x"] = dist * math.cos(th)
-                            p["y"] = dist * math.sin(th)
-                            pts.append(p)
-                        rows = _records_to_points_numpy(pts)
+                    sem = apply_semantics([raw], commands=commands_doc, as_dicts=False)
+                    if sem.applied and sem.points is not None:
+                        # Structured rows (x/y already derived) in the SHM point layout.
+                        rows = sem.points
+                    elif sem.applied:
+                        rows = _records_to_points_numpy(sem.records)
                     else:
                         continue
                 else:
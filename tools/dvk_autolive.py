@@ -28,10 +28,14 @@ from typing import Optional
 
 
 def find_dvk_root(start: Path) -> Path:
-    cur = start.resolve()
-    for parent in [cur, *cur.parents]:
-        if (parent / ".claude-plugin" / "plugin.json").exists():
-            return parent
+    cur = str(start.resolve())
+    while True:
+        if os.path.isfile(os.path.join(cur, ".claude-plugin", "plugin.json")):
+            return Path(cur)
+        parent = os.path.dirname(cur)
+        if parent == cur:
+            break
+        cur = parent
     raise SystemExit("Cannot locate DVK root (missing .claude-plugin/plugin.json)")
 
 